@@ -0,0 +1,197 @@
+import numpy as np
+from collections import namedtuple
+
+# Class-wide analytics for the admin dashboard. app.py bulk-loads Progress once
+# into a ProgressFrame (one NumPy array per column, class/subject dictionary
+# encoded into group codes); every statistic below is then a few grouped array
+# passes (unique / bincount / lexsort) rather than per-row Python work.
+#   frame = build_frame(rows, courses)
+#   stats = compute(frame, students_per_class)
+
+PERCENTILES = (10, 25, 50, 75, 90)
+SCORE_BINS = np.linspace(0.0, 100.0, 11)
+_POPCOUNT_CHUNK = 65536
+
+ProgressFrame = namedtuple('ProgressFrame', [
+    'student',        # int64 student id, one entry per Progress row
+    'course',         # int64 index into the course_* arrays, -1 if the course is unknown
+    'group',          # int64 index into groups
+    'is_assignment',  # bool, assignment submission rather than video progress
+    'videos_done',    # int32 completed videos (video rows)
+    'completed',      # bool
+    'score',          # float64 (assignment rows)
+    'groups',         # list of (class_level, subject)
+    'course_id',      # int64 catalog course ids, sorted
+    'course_group',   # int64 group of each catalog course
+    'course_videos',  # int32 video_count of each catalog course
+    'course_names',   # list of course names, aligned with course_id
+])
+
+
+def packed_popcount(blobs):
+    """Set bits in each little-endian bitset blob, via np.unpackbits in fixed-width chunks."""
+    out = np.zeros(len(blobs), dtype=np.int32)
+    for start in range(0, len(blobs), _POPCOUNT_CHUNK):
+        chunk = blobs[start:start + _POPCOUNT_CHUNK]
+        width = max(len(b) for b in chunk) or 1
+        buf = b''.join(b.ljust(width, b'\0') for b in chunk)
+        bits = np.unpackbits(np.frombuffer(buf, dtype=np.uint8).reshape(len(chunk), width), axis=1)
+        out[start:start + len(chunk)] = bits.sum(axis=1, dtype=np.int32)
+    return out
+
+
+def _group_key(class_level, subject):
+    return f"{class_level or ''}\x1f{subject or 'General'}"
+
+
+def build_frame(rows, courses):
+    """rows: (student_id, course_id, is_assignment, video_bits, score, completed, class_level, subject)
+    courses: (id, name, class_level, subject, video_count) for every catalog course."""
+    courses = sorted(courses, key=lambda c: c[0])
+    keys = [_group_key(c[2], c[3]) for c in courses] + [_group_key(r[6], r[7]) for r in rows]
+    uniq, inverse = np.unique(np.array(keys, dtype=object), return_inverse=True)
+    inverse = inverse.astype(np.int64).reshape(-1)
+    n = len(courses)
+
+    course_id = np.fromiter((c[0] for c in courses), dtype=np.int64, count=n)
+    row_course = np.fromiter(((r[1] if r[1] is not None else -1) for r in rows), dtype=np.int64, count=len(rows))
+    pos = np.searchsorted(course_id, row_course)
+    pos_clipped = np.minimum(pos, max(n - 1, 0))
+    known = (pos < n) & (course_id[pos_clipped] == row_course) if n else np.zeros(len(rows), dtype=bool)
+
+    return ProgressFrame(
+        student=np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows)),
+        course=np.where(known, pos, -1).astype(np.int64),
+        group=inverse[n:],
+        is_assignment=np.fromiter((bool(r[2]) for r in rows), dtype=bool, count=len(rows)),
+        videos_done=packed_popcount([r[3] or b'' for r in rows]),
+        completed=np.fromiter((bool(r[5]) for r in rows), dtype=bool, count=len(rows)),
+        score=np.fromiter(((r[4] or 0.0) for r in rows), dtype=np.float64, count=len(rows)),
+        groups=[tuple(k.split('\x1f', 1)) for k in uniq],
+        course_id=course_id,
+        course_group=inverse[:n],
+        course_videos=np.fromiter(((c[4] or 0) for c in courses), dtype=np.int32, count=n),
+        course_names=[c[1] for c in courses],
+    )
+
+
+def score_distribution(scores):
+    scores = np.asarray(scores, dtype=np.float64)
+    if not len(scores):
+        return {'count': 0, 'mean': None, 'percentiles': {}, 'histogram': [0] * (len(SCORE_BINS) - 1)}
+    counts, _ = np.histogram(np.clip(scores, 0.0, 100.0), bins=SCORE_BINS)
+    return {
+        'count': int(len(scores)),
+        'mean': round(float(scores.mean()), 1),
+        'percentiles': {f'p{q}': round(float(v), 1) for q, v in zip(PERCENTILES, np.percentile(scores, PERCENTILES))},
+        'histogram': counts.tolist(),
+    }
+
+
+def _split_by(keys, values, n):
+    """Split values into n arrays by integer key in [0, n) with one stable sort."""
+    order = np.argsort(keys, kind='stable')
+    bounds = np.cumsum(np.bincount(keys, minlength=n))[:-1]
+    return np.split(values[order], bounds)
+
+
+def _grouped(inverse, n, weights):
+    return np.bincount(inverse, weights=np.asarray(weights, dtype=np.float64), minlength=n)
+
+
+def compute(frame, students_per_class, leaderboard_size=100):
+    """Funnels and score distributions per class/subject group, per-course stats and leaderboards."""
+    n_groups = len(frame.groups)
+    n_courses = len(frame.course_id)
+    video_row = ~frame.is_assignment
+    submitted = frame.is_assignment & frame.completed
+    student_ids, student = np.unique(frame.student, return_inverse=True)
+    student = student.reshape(-1)
+    n_students = max(len(student_ids), 1)
+
+    # Per (group, student) totals
+    pairs, pair = np.unique(frame.group * n_students + student, return_inverse=True)
+    pair = pair.reshape(-1)
+    n_pairs = len(pairs)
+    pair_group = pairs // n_students
+    pair_student = pairs % n_students
+    p_videos = _grouped(pair, n_pairs, np.where(video_row, frame.videos_done, 0))
+    p_courses = _grouped(pair, n_pairs, video_row & frame.completed)
+    p_assignments = _grouped(pair, n_pairs, submitted)
+    p_scores = _grouped(pair, n_pairs, np.where(submitted, frame.score, 0.0))
+
+    group_videos = _grouped(frame.course_group, n_groups, frame.course_videos)
+    half_watched = (group_videos[pair_group] > 0) & (p_videos * 2 >= group_videos[pair_group])
+    funnel = {
+        'started': _grouped(pair_group, n_groups, p_videos > 0),
+        'half_watched': _grouped(pair_group, n_groups, half_watched),
+        'completed_course': _grouped(pair_group, n_groups, p_courses > 0),
+        'submitted_assignment': _grouped(pair_group, n_groups, p_assignments > 0),
+    }
+    group_scores = _split_by(frame.group[submitted], frame.score[submitted], n_groups)
+    groups = []
+    for g, (class_level, subject) in enumerate(frame.groups):
+        stages = {'students': int(students_per_class.get(class_level, 0))}
+        stages.update({k: int(v[g]) for k, v in funnel.items()})
+        groups.append({
+            'class_level': class_level,
+            'subject': subject,
+            'courses': int(np.count_nonzero(frame.course_group == g)),
+            'videos': int(group_videos[g]),
+            'funnel': stages,
+            'scores': score_distribution(group_scores[g]),
+        })
+
+    # Per course: learners, completions, watched fraction and assignment scores
+    on_course = frame.course >= 0
+    vrows = video_row & on_course & ((frame.videos_done > 0) | frame.completed)
+    learners = np.bincount(frame.course[vrows], minlength=n_courses)
+    completions = np.bincount(frame.course[vrows & frame.completed], minlength=n_courses)
+    watched = frame.videos_done[vrows] / np.maximum(frame.course_videos[frame.course[vrows]], 1)
+    watched_by_course = _split_by(frame.course[vrows], np.minimum(watched, 1.0), n_courses)
+    srows = submitted & on_course
+    scores_by_course = _split_by(frame.course[srows], frame.score[srows], n_courses)
+    courses = []
+    for c in range(n_courses):
+        class_level, subject = frame.groups[frame.course_group[c]]
+        w = watched_by_course[c]
+        courses.append({
+            'course_id': int(frame.course_id[c]),
+            'name': frame.course_names[c],
+            'class_level': class_level,
+            'subject': subject,
+            'videos': int(frame.course_videos[c]),
+            'learners': int(learners[c]),
+            'completed': int(completions[c]),
+            'completion_rate': round(float(completions[c]) / learners[c], 3) if learners[c] else None,
+            'watched_fraction': {f'p{q}': round(float(v), 3) for q, v in zip(PERCENTILES, np.percentile(w, PERCENTILES))} if len(w) else {},
+            'scores': score_distribution(scores_by_course[c]),
+        })
+
+    # Leaderboards per class level: average assignment score, then courses and videos completed
+    class_names = sorted({cl for cl, _ in frame.groups})
+    class_of_group = np.array([class_names.index(cl) for cl, _ in frame.groups], dtype=np.int64)
+    entries, entry = np.unique(class_of_group[pair_group] * n_students + pair_student, return_inverse=True)
+    entry = entry.reshape(-1)
+    n_entries = len(entries)
+    e_class = entries // n_students
+    e_student = student_ids[entries % n_students] if len(student_ids) else entries
+    e_videos = _grouped(entry, n_entries, p_videos)
+    e_courses = _grouped(entry, n_entries, p_courses)
+    e_assignments = _grouped(entry, n_entries, p_assignments)
+    e_scores = _grouped(entry, n_entries, p_scores)
+    e_avg = np.divide(e_scores, e_assignments, out=np.full(n_entries, -1.0), where=e_assignments > 0)
+    order = np.lexsort((e_student, -e_videos, -e_courses, -e_avg, e_class))
+    leaderboards = {}
+    for k, class_level in enumerate(class_names):
+        ranked = order[e_class[order] == k][:leaderboard_size]
+        leaderboards[class_level] = [{
+            'rank': rank,
+            'student_id': int(e_student[i]),
+            'average_score': round(float(e_avg[i]), 1) if e_assignments[i] else None,
+            'assignments_completed': int(e_assignments[i]),
+            'courses_completed': int(e_courses[i]),
+            'videos_completed': int(e_videos[i]),
+        } for rank, i in enumerate(ranked, start=1)]
+
+    return {'groups': groups, 'courses': courses, 'leaderboards': leaderboards}
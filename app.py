@@ -11,6 +11,7 @@ from email.message import EmailMessage
 import secrets
 from dotenv import load_dotenv
 import pathlib
+import threading
 
 # Load environment variables
 load_dotenv()
@@ -22,6 +23,46 @@ db_path = pathlib.Path(__file__).parent / "instance" / "edureach.db"
 default_db_uri = f"sqlite:///{db_path.as_posix()}"
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', default_db_uri)
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# SQLite engine profile, applied to every new connection: 'tuned' (WAL, relaxed fsync,
+# busy wait instead of immediate "database is locked", bigger page cache, mmap reads)
+# or 'default' to leave SQLite's stock settings alone.
+app.config['SQLITE_PROFILE'] = os.getenv('SQLITE_PROFILE', 'tuned').lower()
+app.config['SQLITE_JOURNAL_MODE'] = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+app.config['SQLITE_SYNCHRONOUS'] = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+app.config['SQLITE_BUSY_TIMEOUT_MS'] = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '15000'))
+app.config['SQLITE_CACHE_SIZE'] = int(os.getenv('SQLITE_CACHE_SIZE', '-65536'))     # negative = KiB (64 MiB)
+app.config['SQLITE_MMAP_SIZE'] = int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+app.config['SQLITE_POOL_SIZE'] = int(os.getenv('SQLITE_POOL_SIZE', '10'))
+app.config['SQLITE_MAX_OVERFLOW'] = int(os.getenv('SQLITE_MAX_OVERFLOW', '20'))
+app.config['SQLITE_POOL_TIMEOUT'] = int(os.getenv('SQLITE_POOL_TIMEOUT', '30'))
+_db_uri = app.config['SQLALCHEMY_DATABASE_URI']
+_sqlite_tuned = (_db_uri.startswith('sqlite:') and ':memory:' not in _db_uri
+                 and _db_uri not in ('sqlite://', 'sqlite:///') and app.config['SQLITE_PROFILE'] == 'tuned')
+if _sqlite_tuned:
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': app.config['SQLITE_POOL_SIZE'],
+        'max_overflow': app.config['SQLITE_MAX_OVERFLOW'],
+        'pool_timeout': app.config['SQLITE_POOL_TIMEOUT'],
+        'pool_pre_ping': False,
+        'connect_args': {'timeout': app.config['SQLITE_BUSY_TIMEOUT_MS'] / 1000.0},
+    }
+# Optional read replica for read-only endpoints (see use_read_replica below).
+# DATABASE_READ_URL names any read engine; with DB_READ_REPLICA=true and SQLite
+# the primary file is opened again read-only (mode=ro), which in WAL mode reads
+# a consistent snapshot without ever holding up the write path.
+app.config['DATABASE_READ_URL'] = os.getenv('DATABASE_READ_URL', '').strip()
+app.config['DB_READ_REPLICA'] = os.getenv('DB_READ_REPLICA', 'false').lower() in ('1', 'true', 'yes')
+
+# Admin analytics (analytics.py) are recomputed at most this often per process
+app.config['ANALYTICS_REFRESH_SECONDS'] = float(os.getenv('ANALYTICS_REFRESH_SECONDS', '300'))
+# Progress trend rollups: catch up on new events when a trend chart is requested
+# (disable when rollup_progress.py runs on a schedule instead)
+app.config['ROLLUP_ON_READ'] = os.getenv('ROLLUP_ON_READ', 'true').lower() in ('1', 'true', 'yes')
+app.config['ROLLUP_BATCH_SIZE'] = int(os.getenv('ROLLUP_BATCH_SIZE', '5000'))
+# Multi-writer backends only: leave events this recent for the next run (see run_progress_rollup)
+app.config['ROLLUP_SETTLE_SECONDS'] = float(os.getenv('ROLLUP_SETTLE_SECONDS', '0'))
+# Course CSV import commits every this many rows
+app.config['COURSE_IMPORT_CHUNK_SIZE'] = int(os.getenv('COURSE_IMPORT_CHUNK_SIZE', '2000'))
 
 # Outgoing email (configure via environment variables)
 app.config['MAIL_MODE'] = os.getenv('MAIL_MODE', '').lower()  # 'smtp' or 'file' (dev)
@@ -34,6 +75,42 @@ app.config['MAIL_USE_SSL'] = os.getenv('MAIL_USE_SSL', 'false').lower() in ('1',
 app.config['MAIL_FROM'] = os.getenv('MAIL_FROM', os.getenv('MAIL_USERNAME', 'no-reply@edureach.local'))
 # Mirror emails to local outbox even when using SMTP (development convenience)
 app.config['MAIL_MIRROR_FILE'] = os.getenv('MAIL_MIRROR_FILE', 'false').lower() in ('1', 'true', 'yes')
+# Queue SMTP mail and send it from a background worker instead of inside the request
+app.config['MAIL_ASYNC'] = os.getenv('MAIL_ASYNC', 'true').lower() in ('1', 'true', 'yes')
+app.config['MAIL_BATCH_SIZE'] = int(os.getenv('MAIL_BATCH_SIZE', '50'))              # messages claimed per batch
+app.config['MAIL_MAX_ATTEMPTS'] = int(os.getenv('MAIL_MAX_ATTEMPTS', '5'))           # then marked failed
+app.config['MAIL_RETRY_BASE_SECONDS'] = int(os.getenv('MAIL_RETRY_BASE_SECONDS', '30'))  # doubles per attempt
+app.config['MAIL_SMTP_IDLE_SECONDS'] = int(os.getenv('MAIL_SMTP_IDLE_SECONDS', '60'))    # close idle connection after
+app.config['MAIL_POLL_SECONDS'] = float(os.getenv('MAIL_POLL_SECONDS', '5'))
+# File-mode storage: 'eml' (one file per message) or 'spool' (rotating JSONL segments, see mail_spool.py)
+app.config['MAIL_FILE_FORMAT'] = os.getenv('MAIL_FILE_FORMAT', 'eml').lower()
+app.config['MAIL_SPOOL_SEGMENT_MB'] = int(os.getenv('MAIL_SPOOL_SEGMENT_MB', '16'))
+app.config['MAIL_SPOOL_COMPRESS'] = os.getenv('MAIL_SPOOL_COMPRESS', 'true').lower() in ('1', 'true', 'yes')
+app.config['MAIL_SPOOL_RETENTION_DAYS'] = int(os.getenv('MAIL_SPOOL_RETENTION_DAYS', '14'))  # 0 keeps everything
+# Password hashing policy: Werkzeug method string for stored passwords, e.g.
+# 'scrypt:32768:8:1' or 'pbkdf2:sha256:600000'. Hashes made with a different
+# method are upgraded on the next successful login. OTPs use a keyed HMAC.
+app.config['PASSWORD_HASH_METHOD'] = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+app.config['OTP_HMAC_KEY'] = os.getenv('OTP_HMAC_KEY', '')  # defaults to a key derived from SECRET_KEY
+# Pending login OTPs (see otp_store.py): 'sqlite' keeps them in a separate WAL file
+# shared by all worker processes on the host; 'memory' is per-process (dev server).
+app.config['OTP_STORE'] = os.getenv('OTP_STORE', 'sqlite').lower()
+app.config['OTP_STORE_PATH'] = os.getenv('OTP_STORE_PATH', '')  # default instance/otp.db
+app.config['OTP_TTL_SECONDS'] = int(os.getenv('OTP_TTL_SECONDS', '300'))
+app.config['OTP_MAX_ATTEMPTS'] = int(os.getenv('OTP_MAX_ATTEMPTS', '5'))
+app.config['OTP_SWEEP_SECONDS'] = float(os.getenv('OTP_SWEEP_SECONDS', '60'))
+# Optional stateless bearer tokens for the JSON API: signed with SECRET_KEY and
+# carrying the student id, class level and admin flag, so any worker/node can
+# authorize "Authorization: Bearer <token>" without touching the database.
+app.config['API_TOKENS'] = os.getenv('API_TOKENS', 'false').lower() in ('1', 'true', 'yes')
+app.config['API_TOKEN_TTL_SECONDS'] = int(os.getenv('API_TOKEN_TTL_SECONDS', '900'))
+# Optional process pool for password KDF work, so login bursts queue there instead of
+# pinning request threads. 0 workers = hash inline. When more than HASH_POOL_MAX_PENDING
+# jobs are waiting, login/register answer 503 with Retry-After right away.
+app.config['HASH_POOL_WORKERS'] = int(os.getenv('HASH_POOL_WORKERS', '0'))
+app.config['HASH_POOL_MAX_PENDING'] = int(os.getenv('HASH_POOL_MAX_PENDING', '0'))  # 0 -> 4 x workers
+app.config['HASH_POOL_TIMEOUT_SECONDS'] = float(os.getenv('HASH_POOL_TIMEOUT_SECONDS', '10'))
+app.config['HASH_POOL_RETRY_AFTER'] = int(os.getenv('HASH_POOL_RETRY_AFTER', '2'))
 # Optional: base URL to use when building absolute links in emails (for LAN/mobile testing)
 # Example: http://192.168.1.50:5000
 app.config['EXTERNAL_BASE_URL'] = os.getenv('EXTERNAL_BASE_URL', '').strip()
@@ -51,7 +128,97 @@ try:
 except Exception:
     pass
 
-db = SQLAlchemy(app)
+from flask_sqlalchemy.session import Session as _FSASession
+
+_read_engine = None
+
+class RoutingSession(_FSASession):
+    """Sends SELECTs to the read engine inside views marked @use_read_replica.
+    Flushes and any non-SELECT statement still go to the primary engine."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _read_engine is not None and not self._flushing:
+            from flask import g, has_request_context
+            if has_request_context() and g.get('db_read_replica') and (clause is None or getattr(clause, 'is_select', False)):
+                return _read_engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+db = SQLAlchemy(app, session_options={'class_': RoutingSession})
+
+def _apply_sqlite_pragmas(dbapi_conn, connection_record):
+    cur = dbapi_conn.cursor()
+    try:
+        cur.execute(f"PRAGMA journal_mode={app.config['SQLITE_JOURNAL_MODE']}")
+        cur.execute(f"PRAGMA synchronous={app.config['SQLITE_SYNCHRONOUS']}")
+        cur.execute(f"PRAGMA busy_timeout={int(app.config['SQLITE_BUSY_TIMEOUT_MS'])}")
+        cur.execute(f"PRAGMA cache_size={int(app.config['SQLITE_CACHE_SIZE'])}")
+        cur.execute(f"PRAGMA mmap_size={int(app.config['SQLITE_MMAP_SIZE'])}")
+        cur.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cur.close()
+
+if _sqlite_tuned:
+    from sqlalchemy import event
+    with app.app_context():
+        event.listen(db.engine, 'connect', _apply_sqlite_pragmas)
+
+def _apply_sqlite_read_pragmas(dbapi_conn, connection_record):
+    cur = dbapi_conn.cursor()
+    try:
+        cur.execute("PRAGMA query_only=ON")
+        cur.execute(f"PRAGMA busy_timeout={int(app.config['SQLITE_BUSY_TIMEOUT_MS'])}")
+        cur.execute(f"PRAGMA cache_size={int(app.config['SQLITE_CACHE_SIZE'])}")
+        cur.execute(f"PRAGMA mmap_size={int(app.config['SQLITE_MMAP_SIZE'])}")
+        cur.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cur.close()
+
+def _sqlite_read_only_uri(uri: str):
+    """sqlite:///path -> read-only URI-filename form of the same file, or None."""
+    from sqlalchemy.engine import make_url
+    url = make_url(uri)
+    path = url.database
+    if url.get_backend_name() != 'sqlite' or not path or path == ':memory:' or path.startswith('file:'):
+        return None
+    if not os.path.isabs(path):
+        # Flask-SQLAlchemy resolves relative SQLite paths against the instance folder
+        path = os.path.join(app.instance_path, path)
+    return f"sqlite:///file:{pathlib.Path(path).as_posix()}?mode=ro&uri=true"
+
+def _init_read_engine() -> None:
+    global _read_engine
+    read_uri = app.config.get('DATABASE_READ_URL')
+    if not read_uri and app.config.get('DB_READ_REPLICA'):
+        read_uri = _sqlite_read_only_uri(app.config['SQLALCHEMY_DATABASE_URI'])
+        if not read_uri:
+            app.logger.warning('DB_READ_REPLICA needs a file-backed SQLite database or DATABASE_READ_URL; disabled')
+    if not read_uri:
+        return
+    from sqlalchemy import create_engine, event
+    options = {}
+    if read_uri.startswith('sqlite:'):
+        options = {
+            'pool_size': app.config['SQLITE_POOL_SIZE'],
+            'max_overflow': app.config['SQLITE_MAX_OVERFLOW'],
+            'pool_timeout': app.config['SQLITE_POOL_TIMEOUT'],
+            'connect_args': {'timeout': app.config['SQLITE_BUSY_TIMEOUT_MS'] / 1000.0},
+        }
+    _read_engine = create_engine(read_uri, **options)
+    if read_uri.startswith('sqlite:'):
+        event.listen(_read_engine, 'connect', _apply_sqlite_read_pragmas)
+
+_init_read_engine()
+
+from functools import wraps as _wraps
+
+def use_read_replica(view_func):
+    """Route this view's SELECTs to the read engine when one is configured."""
+    @_wraps(view_func)
+    def _wrapped(*args, **kwargs):
+        from flask import g
+        g.db_read_replica = True
+        return view_func(*args, **kwargs)
+    return _wrapped
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
@@ -71,6 +238,7 @@ class Student(UserMixin, db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     progress = db.relationship('Progress', backref='student', lazy=True, cascade='all, delete-orphan')
+    summary = db.relationship('StudentSummary', uselist=False, lazy=True, cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<Student {self.email}>'
@@ -82,22 +250,77 @@ class Course(db.Model):
     subject = db.Column(db.String(50), nullable=False, default='')  # Physics, Chemistry, Mathematics
     description = db.Column(db.Text)
     video_data = db.Column(db.Text)  # JSON string containing video info with titles and descriptions
+    video_count = db.Column(db.Integer, nullable=False, default=0)  # denormalized len(videos)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     progress = db.relationship('Progress', backref='course', lazy=True)
     assignments = db.relationship('Assignment', backref='course', lazy=True)
+    videos = db.relationship('CourseVideo', backref='course', lazy=True, order_by='CourseVideo.position', cascade='all, delete-orphan')
+
+    # Catalog reads filter by class and subject together
+    __table_args__ = (db.Index('ix_course_class_subject', 'class_level', 'subject'),)
     
     def __repr__(self):
         return f'<Course {self.name} - {self.class_level} - {self.subject}>'
     
     def get_videos(self):
+        return [v.to_dict() for v in self.videos]
+
+    def set_videos(self, entries):
+        """Replace this course's videos; keeps CourseVideo rows, video_count and the video_data blob in sync."""
         import json
-        if self.video_data:
-            try:
-                return json.loads(self.video_data)
-            except:
-                return []
-        return []
+        from sqlalchemy.orm import object_session
+        entries = [e for e in (entries or []) if isinstance(e, dict)]
+        session = object_session(self)
+        if session is not None and self.id is not None and self.videos:
+            # The unit of work inserts before it deletes orphans; flush the deletes
+            # first so new rows can reuse (course_id, position)
+            self.videos.clear()
+            session.flush()
+        self.videos = [CourseVideo.from_dict(i, e) for i, e in enumerate(entries)]
+        self.video_count = len(entries)
+        self.video_data = json.dumps(entries, ensure_ascii=False)
+
+class CourseVideo(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    course_id = db.Column(db.Integer, db.ForeignKey('course.id'), nullable=False)
+    position = db.Column(db.Integer, nullable=False)  # 0-based index used by video progress
+    title = db.Column(db.String(200), nullable=False, default='')
+    url = db.Column(db.String(500), nullable=False, default='')
+    description = db.Column(db.Text)
+    search_url = db.Column(db.String(500))
+    title_i18n = db.Column(db.JSON)  # {"te": "...", "kn": "..."}
+    extra = db.Column(db.JSON)  # any other keys from the source entry (e.g. recommended_channel)
+
+    __table_args__ = (db.UniqueConstraint('course_id', 'position', name='uq_course_video_position'),)
+
+    _KNOWN_KEYS = ('title', 'url', 'description', 'search_url', 'title_i18n')
+
+    def __repr__(self):
+        return f'<CourseVideo {self.course_id}#{self.position} {self.title}>'
+
+    @classmethod
+    def from_dict(cls, position, entry):
+        extra = {k: v for k, v in entry.items() if k not in cls._KNOWN_KEYS}
+        return cls(
+            position=position,
+            title=entry.get('title') or '',
+            url=entry.get('url') or '',
+            description=entry.get('description'),
+            search_url=entry.get('search_url') or None,
+            title_i18n=entry.get('title_i18n') or None,
+            extra=extra or None
+        )
+
+    def to_dict(self):
+        d = {'title': self.title, 'url': self.url, 'description': self.description}
+        if self.search_url:
+            d['search_url'] = self.search_url
+        if self.title_i18n:
+            d['title_i18n'] = self.title_i18n
+        if self.extra:
+            d.update(self.extra)
+        return d
 
 class Assignment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -106,6 +329,7 @@ class Assignment(db.Model):
     description = db.Column(db.Text)
     questions = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     progress = db.relationship('Progress', backref='assignment', lazy=True)
     
@@ -122,8 +346,11 @@ class Progress(db.Model):
     student_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False)
     course_id = db.Column(db.Integer, db.ForeignKey('course.id'), nullable=False)
     assignment_id = db.Column(db.Integer, db.ForeignKey('assignment.id'), nullable=True)
-    video_progress = db.Column(db.Text)  # JSON string tracking which videos are completed
+    video_progress = db.Column(db.Text)  # legacy JSON {"completed": [...]}; superseded by video_bits
+    video_bits = db.Column(db.LargeBinary)  # little-endian bitset, bit i set == video i completed
     score = db.Column(db.Float, default=0.0)
+    answers_packed = db.Column(db.LargeBinary)  # MCQ answers, one byte per question (see pack_answers)
+    answers_json = db.Column(db.Text)  # raw MCQ answers as a JSON list, when the key is not compiled
     completed = db.Column(db.Boolean, default=False)
     completed_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -131,6 +358,245 @@ class Progress(db.Model):
     def __repr__(self):
         return f'<Progress {self.student_id} - Course {self.course_id}>'
 
+    def get_video_mask(self) -> int:
+        if self.video_bits:
+            return int.from_bytes(self.video_bits, 'little')
+        # Rows not yet migrated still carry the JSON list
+        return _mask_from_video_json(self.video_progress)
+
+    def set_video_mask(self, mask: int) -> None:
+        self.video_bits = mask.to_bytes(max(1, (mask.bit_length() + 7) // 8), 'little')
+        self.video_progress = None
+
+    def mark_video_completed(self, index: int) -> bool:
+        """Set the bit for a video; returns False when it was already set."""
+        mask = self.get_video_mask()
+        bit = 1 << index
+        if mask & bit:
+            return False
+        self.set_video_mask(mask | bit)
+        return True
+
+    def completed_videos(self):
+        return _mask_to_indices(self.get_video_mask())
+
+    def completed_video_count(self) -> int:
+        return bin(self.get_video_mask()).count('1')
+
+def _mask_to_indices(mask: int):
+    out = []
+    i = 0
+    while mask:
+        if mask & 1:
+            out.append(i)
+        mask >>= 1
+        i += 1
+    return out
+
+def _mask_from_video_json(text) -> int:
+    import json as _json
+    if not text:
+        return 0
+    try:
+        indices = _json.loads(text).get('completed', [])
+    except Exception:
+        return 0
+    mask = 0
+    for i in indices:
+        if isinstance(i, int) and i >= 0:
+            mask |= 1 << i
+    return mask
+
+def _all_videos_mask(video_count: int) -> int:
+    return (1 << video_count) - 1 if video_count > 0 else 0
+
+class StudentSummary(db.Model):
+    """Per-student progress totals, kept in step with Progress by the write endpoints.
+
+    Served to the dashboard and progress charts with one primary-key read instead
+    of loading and decoding every Progress row. rebuild_student_summaries()
+    recomputes rows from Progress after bulk changes (regrades, cleanups).
+    """
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), primary_key=True)
+    videos_completed = db.Column(db.Integer, nullable=False, default=0)
+    courses_completed = db.Column(db.Integer, nullable=False, default=0)
+    assignments_completed = db.Column(db.Integer, nullable=False, default=0)
+    score_total = db.Column(db.Float, nullable=False, default=0.0)  # sum of completed assignment scores
+    by_subject = db.Column(db.JSON)  # {"Physics": {"videos": n, "courses": n, "assignments": n, "score_total": x}}
+    last_activity_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<StudentSummary {self.student_id} videos={self.videos_completed} courses={self.courses_completed}>'
+
+    def to_dict(self):
+        def avg(total, n):
+            return round(total / n, 1) if n else None
+        return {
+            'student_id': self.student_id,
+            'videos_completed': self.videos_completed,
+            'courses_completed': self.courses_completed,
+            'assignments_completed': self.assignments_completed,
+            'average_score': avg(self.score_total, self.assignments_completed),
+            'last_activity_at': self.last_activity_at.isoformat() if self.last_activity_at else None,
+            'subjects': {
+                subject: {
+                    'videos_completed': v.get('videos', 0),
+                    'courses_completed': v.get('courses', 0),
+                    'assignments_completed': v.get('assignments', 0),
+                    'average_score': avg(v.get('score_total', 0.0), v.get('assignments', 0)),
+                } for subject, v in sorted((self.by_subject or {}).items())
+            }
+        }
+
+_SUMMARY_KEYS = ('videos', 'courses', 'assignments', 'score_total')
+_SUMMARY_COLUMNS = {'videos': 'videos_completed', 'courses': 'courses_completed',
+                    'assignments': 'assignments_completed', 'score_total': 'score_total'}
+
+def _summary_subject(subject) -> str:
+    return subject or 'General'
+
+def get_student_summary(student_id: int) -> dict:
+    summary = db.session.get(StudentSummary, student_id)
+    if summary is None:
+        summary = StudentSummary(student_id=student_id, videos_completed=0, courses_completed=0,
+                                 assignments_completed=0, score_total=0.0, by_subject={})
+    return summary.to_dict()
+
+def apply_summary_deltas(student_id: int, deltas: dict, at=None) -> None:
+    """Add per-subject deltas ({subject: {"videos": +1, ...}}) to a student's summary.
+
+    Call after the matching Progress changes are flushed and before the commit,
+    so both land in one transaction. A missing summary row is rebuilt from
+    Progress (which already includes this change) rather than started at zero.
+    """
+    if not any(v for d in deltas.values() for v in d.values()):
+        # Replays and identical resubmissions change nothing, not even activity time
+        return
+    summary = db.session.get(StudentSummary, student_id)
+    if summary is None:
+        rebuild_student_summaries([student_id])
+        return
+    by_subject = {k: dict(v) for k, v in (summary.by_subject or {}).items()}
+    for subject, d in deltas.items():
+        entry = by_subject.setdefault(_summary_subject(subject), dict.fromkeys(_SUMMARY_KEYS, 0))
+        for key in _SUMMARY_KEYS:
+            change = d.get(key, 0)
+            if change:
+                entry[key] = entry.get(key, 0) + change
+                setattr(summary, _SUMMARY_COLUMNS[key], getattr(summary, _SUMMARY_COLUMNS[key]) + change)
+    # Assign a new dict: in-place edits of a JSON column are not tracked
+    summary.by_subject = by_subject
+    at = at or datetime.utcnow()
+    if summary.last_activity_at is None or at > summary.last_activity_at:
+        summary.last_activity_at = at
+
+def rebuild_student_summaries(student_ids=None, chunk_size: int = 500) -> int:
+    """Recompute StudentSummary rows from Progress (all students when student_ids is None).
+
+    Does not commit; returns the number of summaries written.
+    """
+    from sqlalchemy.orm import aliased
+    course_c = aliased(Course)
+    assignment_c = aliased(Course)
+    totals = {}
+    if student_ids is not None:
+        student_ids = sorted(set(student_ids))
+        for sid in student_ids:
+            totals[sid] = {}
+        chunks = [student_ids[i:i + chunk_size] for i in range(0, len(student_ids), chunk_size)]
+    else:
+        chunks = [None]
+    activity = {}
+    for chunk in chunks:
+        q = (db.session.query(Progress.student_id, Progress.assignment_id, Progress.video_bits, Progress.video_progress,
+                              Progress.score, Progress.completed, Progress.completed_at, Progress.created_at,
+                              db.func.coalesce(assignment_c.subject, course_c.subject))
+             .outerjoin(course_c, course_c.id == Progress.course_id)
+             .outerjoin(Assignment, Assignment.id == Progress.assignment_id)
+             .outerjoin(assignment_c, assignment_c.id == Assignment.course_id))
+        if chunk is not None:
+            q = q.filter(Progress.student_id.in_(chunk))
+        for sid, assignment_id, bits, video_json, score, completed, completed_at, created_at, subject in q.yield_per(1000):
+            entry = totals.setdefault(sid, {}).setdefault(_summary_subject(subject), dict.fromkeys(_SUMMARY_KEYS, 0))
+            if assignment_id is not None:
+                if completed:
+                    entry['assignments'] += 1
+                    entry['score_total'] += score or 0.0
+            else:
+                mask = int.from_bytes(bits, 'little') if bits else _mask_from_video_json(video_json)
+                entry['videos'] += bin(mask).count('1')
+                if completed:
+                    entry['courses'] += 1
+            for t in (completed_at, created_at):
+                if t is not None and (activity.get(sid) is None or t > activity[sid]):
+                    activity[sid] = t
+
+    if student_ids is None:
+        db.session.query(StudentSummary).delete()
+    else:
+        for chunk in chunks:
+            db.session.query(StudentSummary).filter(StudentSummary.student_id.in_(chunk)).delete()
+    rows = []
+    for sid, subjects in totals.items():
+        row = {'student_id': sid, 'by_subject': subjects, 'last_activity_at': activity.get(sid),
+               'updated_at': datetime.utcnow()}
+        for key, column in _SUMMARY_COLUMNS.items():
+            row[column] = sum(v[key] for v in subjects.values())
+        rows.append(row)
+    for i in range(0, len(rows), chunk_size):
+        db.session.execute(db.insert(StudentSummary), rows[i:i + chunk_size])
+    return len(rows)
+
+class ProgressEvent(db.Model):
+    """Append-only log of progress changes; run_progress_rollup() consumes it by id."""
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, nullable=False)
+    kind = db.Column(db.String(20), nullable=False)  # video, course_complete, assignment, score_adjust
+    course_id = db.Column(db.Integer)
+    assignment_id = db.Column(db.Integer)
+    video_index = db.Column(db.Integer)
+    score = db.Column(db.Float)
+    class_level = db.Column(db.String(20))
+    subject = db.Column(db.String(50))
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ProgressEvent {self.id} {self.kind} student={self.student_id}>'
+
+class ProgressRollup(db.Model):
+    """Hourly/daily progress totals per class level and subject ('*' rows are totals across that dimension)."""
+    bucket = db.Column(db.String(4), primary_key=True)  # hour, day
+    period_start = db.Column(db.DateTime, primary_key=True)
+    class_level = db.Column(db.String(20), primary_key=True)
+    subject = db.Column(db.String(50), primary_key=True)
+    videos_watched = db.Column(db.Integer, nullable=False, default=0)
+    courses_completed = db.Column(db.Integer, nullable=False, default=0)
+    assignments_submitted = db.Column(db.Integer, nullable=False, default=0)
+    score_total = db.Column(db.Float, nullable=False, default=0.0)
+    active_students = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<ProgressRollup {self.bucket} {self.period_start} {self.class_level}/{self.subject}>'
+
+class RollupActiveStudent(db.Model):
+    """Students already counted in a rollup period; pruned once the period is closed."""
+    bucket = db.Column(db.String(4), primary_key=True)
+    period_start = db.Column(db.DateTime, primary_key=True)
+    class_level = db.Column(db.String(20), primary_key=True)
+    subject = db.Column(db.String(50), primary_key=True)
+    student_id = db.Column(db.Integer, primary_key=True)
+
+class RollupState(db.Model):
+    name = db.Column(db.String(50), primary_key=True)
+    last_event_id = db.Column(db.Integer, nullable=False, default=0)  # high-water mark
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+def record_progress_event(student_id: int, kind: str, class_level=None, subject=None, **fields) -> None:
+    """Append a ProgressEvent in the caller's transaction (committed with the Progress change)."""
+    db.session.add(ProgressEvent(student_id=student_id, kind=kind, class_level=class_level,
+                                 subject=_summary_subject(subject), **fields))
+
 class ContactLog(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -141,6 +607,7 @@ class ContactLog(db.Model):
     def __repr__(self):
         return f'<ContactLog {self.name} - {self.email}>'
 
+# Legacy OTP table; pending codes now live in the OTP store (otp_store.py)
 class PendingOTP(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False)
@@ -153,39 +620,483 @@ class PendingOTP(db.Model):
     def __repr__(self):
         return f'<PendingOTP user={self.user_id} expires={self.expires_at.isoformat()}>'
 
+class OutboundEmail(db.Model):
+    """Persistent queue of SMTP messages drained by the background mail worker."""
+    id = db.Column(db.Integer, primary_key=True)
+    to_email = db.Column(db.String(120), nullable=False)
+    subject = db.Column(db.String(200), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(10), nullable=False, default='queued')  # queued, sending, sent, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    claim_token = db.Column(db.String(32))
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+
+    __table_args__ = (db.Index('ix_outbound_email_due', 'status', 'next_attempt_at'),)
+
+    def __repr__(self):
+        return f'<OutboundEmail {self.id} {self.status} to={self.to_email}>'
+
+# Flask-Login loads the user on every authenticated request. Keep slim, immutable
+# snapshots in a per-process LRU with a TTL so most requests skip that SELECT.
+# Writers call invalidate_user_cache(); it also touches instance/users.stamp so
+# other processes (and scripts like reset_admin.py) can invalidate everyone.
+from collections import namedtuple, OrderedDict
+
+class UserSnapshot(namedtuple('UserSnapshot', ['id', 'name', 'email', 'class_level', 'is_admin', 'email_verified']), UserMixin):
+    @classmethod
+    def from_student(cls, s):
+        return cls(s.id, s.name, s.email, s.class_level, bool(s.is_admin), bool(s.email_verified))
+
+app.config['USER_CACHE_SIZE'] = int(os.getenv('USER_CACHE_SIZE', '2048'))
+app.config['USER_CACHE_TTL_SECONDS'] = float(os.getenv('USER_CACHE_TTL_SECONDS', '300'))
+_user_cache = OrderedDict()
+_user_cache_lock = threading.Lock()
+_user_cache_stats = {'hits': 0, 'misses': 0}
+_user_cache_stamp = [None]
+
+def _users_stamp_path() -> str:
+    return os.path.join(app.instance_path, 'users.stamp')
+
+def _users_stamp() -> int:
+    try:
+        return os.stat(_users_stamp_path()).st_mtime_ns
+    except OSError:
+        return 0
+
+def invalidate_user_cache(user_id=None) -> None:
+    with _user_cache_lock:
+        if user_id is None:
+            _user_cache.clear()
+        else:
+            _user_cache.pop(int(user_id), None)
+    try:
+        path = _users_stamp_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'a'):
+            pass
+        os.utime(path, None)
+    except Exception as e:
+        app.logger.warning(f"Failed to touch users stamp: {e}")
+
+def user_cache_stats() -> dict:
+    with _user_cache_lock:
+        return dict(_user_cache_stats, size=len(_user_cache))
+
 @login_manager.user_loader
 def load_user(user_id):
-    return Student.query.get(int(user_id))
-
-# Ensure new tables are created (e.g., PendingOTP)
-with app.app_context():
+    import time as _time
+    uid = int(user_id)
+    now = _time.monotonic()
+    stamp = _users_stamp()
+    with _user_cache_lock:
+        if _user_cache_stamp[0] != stamp:
+            # Another process changed a student: drop everything we hold
+            _user_cache.clear()
+            _user_cache_stamp[0] = stamp
+        entry = _user_cache.get(uid)
+        if entry is not None and now - entry[1] < app.config['USER_CACHE_TTL_SECONDS']:
+            _user_cache.move_to_end(uid)
+            _user_cache_stats['hits'] += 1
+            return entry[0]
+        _user_cache_stats['misses'] += 1
+    student = Student.query.get(uid)
+    if student is None:
+        return None
+    snapshot = UserSnapshot.from_student(student)
+    with _user_cache_lock:
+        if _user_cache_stamp[0] == stamp:
+            _user_cache[uid] = (snapshot, now)
+            _user_cache.move_to_end(uid)
+            while len(_user_cache) > app.config['USER_CACHE_SIZE']:
+                _user_cache.popitem(last=False)
+    return snapshot
+
+def backfill_course_videos() -> int:
+    """Rebuild CourseVideo rows and video_count from every Course.video_data blob."""
+    import json as _json
+    courses = Course.query.all()
+    for course in courses:
+        try:
+            entries = _json.loads(course.video_data) if course.video_data else []
+        except Exception:
+            entries = []
+        course.set_videos(entries if isinstance(entries, list) else [])
+    db.session.commit()
+    return len(courses)
+
+def backfill_video_bits(batch_size: int = 1000) -> int:
+    """Convert legacy Progress.video_progress JSON into video_bits, in batches."""
+    from sqlalchemy.orm import load_only
+    converted = 0
+    while True:
+        # Load only these columns: columns added by later migrations do not exist yet
+        rows = (Progress.query
+                .options(load_only(Progress.id, Progress.video_progress, Progress.video_bits))
+                .filter(Progress.video_bits.is_(None), Progress.video_progress.isnot(None))
+                .limit(batch_size).all())
+        if not rows:
+            break
+        for p in rows:
+            p.set_video_mask(_mask_from_video_json(p.video_progress))
+        db.session.commit()
+        converted += len(rows)
+    return converted
+
+# Versioned schema migrations. The applied version is stored in SQLite's
+# PRAGMA user_version, so an up-to-date database costs one read at startup.
+# Steps must stay idempotent (check before ALTER): databases created before
+# versioning start at 0 with some of these columns already present, and two
+# processes may start on an old database at the same time.
+def _table_columns(table: str) -> set:
+    from sqlalchemy import text
+    return {r[1].lower() for r in db.session.execute(text(f"PRAGMA table_info({table})")).fetchall()}
+
+def _add_column(table: str, column: str, ddl: str) -> bool:
+    """ALTER TABLE ... ADD COLUMN unless present; True if this call added it."""
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+    cols = _table_columns(table)
+    if not cols or column in cols:
+        return False
     try:
+        db.session.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+        db.session.commit()
+    except OperationalError as e:
+        db.session.rollback()
+        if 'duplicate column' in str(e).lower():
+            return False
+        raise
+    return True
+
+def _migration_1() -> None:
+    # Baseline: tables plus the columns older databases gained through the
+    # former migrate_add_*.py / migrate_update_progress_table.py scripts
+    db.create_all()
+    _add_column('student', 'email_verified', 'BOOLEAN NOT NULL DEFAULT 0')
+    _add_column('student', 'is_admin', 'BOOLEAN NOT NULL DEFAULT 0')
+    _add_column('course', 'class_level', 'VARCHAR(20)')
+    _add_column('course', 'video_data', 'TEXT')
+    _add_column('course', 'subject', "VARCHAR(50) DEFAULT ''")
+    _add_column('assignment', 'course_id', 'INTEGER')
+    _add_column('progress', 'video_progress', 'TEXT')
+    _add_column('progress', 'score', 'FLOAT DEFAULT 0.0')
+    _add_column('progress', 'completed', 'BOOLEAN DEFAULT 0')
+    _add_column('progress', 'completed_at', 'DATETIME')
+
+def _migration_2() -> None:
+    # Normalized course videos, progress bitsets, packed MCQ answers
+    from sqlalchemy import text
+    added_video_count = _add_column('course', 'video_count', 'INTEGER NOT NULL DEFAULT 0')
+    added_video_bits = _add_column('progress', 'video_bits', 'BLOB')
+    _add_column('progress', 'answers_packed', 'BLOB')
+    _add_column('assignment', 'updated_at', 'DATETIME')
+    # One-shot data backfills, run only after every column above exists (they use the ORM)
+    if added_video_count:
+        n = backfill_course_videos()
+        app.logger.info(f"Migrated videos for {n} courses into course_video")
+    if added_video_bits:
+        n = backfill_video_bits()
+        app.logger.info(f"Converted video progress for {n} progress rows to bitsets")
+    # create_all() only builds indexes for new tables; add them to existing ones
+    db.session.execute(text("CREATE INDEX IF NOT EXISTS ix_course_class_subject ON course (class_level, subject)"))
+    db.session.commit()
+
+def _migration_3() -> None:
+    # Materialized per-student progress summaries, backfilled from Progress
+    StudentSummary.__table__.create(bind=db.engine, checkfirst=True)
+    n = rebuild_student_summaries()
+    db.session.commit()
+    app.logger.info(f"Built progress summaries for {n} students")
+
+def _migration_4() -> None:
+    # Progress event log and the hourly/daily rollups built from it
+    for model in (ProgressEvent, ProgressRollup, RollupActiveStudent, RollupState):
+        model.__table__.create(bind=db.engine, checkfirst=True)
+
+def _migration_5() -> None:
+    # Raw answers for submissions to uncompiled keys; assignment rows take their course
+    from sqlalchemy import text
+    _add_column('progress', 'answers_json', 'TEXT')
+    db.session.execute(text(
+        "UPDATE progress SET course_id = (SELECT course_id FROM assignment WHERE assignment.id = progress.assignment_id) "
+        "WHERE assignment_id IS NOT NULL AND course_id IS NULL"
+    ))
+    db.session.commit()
+
+MIGRATIONS = [
+    (1, _migration_1),
+    (2, _migration_2),
+    (3, _migration_3),
+    (4, _migration_4),
+    (5, _migration_5),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def get_schema_version():
+    """Applied schema version, or None when the database is not SQLite."""
+    from sqlalchemy import text
+    if db.engine.dialect.name != 'sqlite':
+        return None
+    return db.session.execute(text("PRAGMA user_version")).scalar() or 0
+
+def migrate_database() -> int:
+    """Apply pending migrations; returns the schema version afterwards."""
+    from sqlalchemy import text
+    version = get_schema_version()
+    if version is None:
         db.create_all()
-    except Exception as _e:
-        app.logger.warning(f"db.create_all() failed: {_e}")
-    # Lightweight schema migration for new columns on existing tables (SQLite-only safe ops)
-    try:
-        from sqlalchemy import text
-        # Check columns on student table and add missing ones (SQLite-safe)
-        res = db.session.execute(text("PRAGMA table_info(student)")).fetchall()
-        cols = {r[1].lower() for r in res}
-        if 'email_verified' not in cols:
-            db.session.execute(text("ALTER TABLE student ADD COLUMN email_verified BOOLEAN NOT NULL DEFAULT 0"))
-            db.session.commit()
-        if 'is_admin' not in cols:
-            db.session.execute(text("ALTER TABLE student ADD COLUMN is_admin BOOLEAN NOT NULL DEFAULT 0"))
-            db.session.commit()
-    except Exception as _e:
-        app.logger.warning(f"Schema check/migrate failed or not needed: {_e}")
+        return SCHEMA_VERSION
+    for target, step in MIGRATIONS:
+        if target <= version:
+            continue
+        app.logger.info(f"Applying schema migration {target}")
+        step()
+        # PRAGMA does not take bound parameters; target is our own integer
+        db.session.execute(text(f"PRAGMA user_version = {int(target)}"))
+        db.session.commit()
+        version = target
+    return version
+
+_app_ready = False
+_app_ready_lock = threading.Lock()
+
+def create_app():
+    """Return the application with its database schema brought up to date.
+
+    Importing this module does no database work; servers and scripts call
+    create_app() once, which is a single PRAGMA read on a current database.
+    """
+    global _app_ready
+    with _app_ready_lock:
+        if not _app_ready:
+            with app.app_context():
+                try:
+                    migrate_database()
+                except Exception as _e:
+                    # Never serve a half-migrated schema; the next create_app() retries
+                    db.session.rollback()
+                    app.logger.error(f"Schema migration failed: {_e}")
+                    raise
+            _app_ready = True
+    return app
 
 # Email utility
 
+def _smtp_settings_ok() -> bool:
+    server = app.config.get('MAIL_SERVER')
+    username = app.config.get('MAIL_USERNAME')
+    password = app.config.get('MAIL_PASSWORD')
+    # Username/password may be left empty for an unauthenticated relay (e.g. a local test server)
+    return bool(server and app.config.get('MAIL_FROM') and (password or not username))
+
+def _build_message(to_email: str, subject: str, body: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg['Subject'] = subject
+    msg['From'] = app.config.get('MAIL_FROM')
+    msg['To'] = to_email
+    msg.set_content(body)
+    return msg
+
+class SMTPConnection:
+    """A single SMTP session reused across messages.
+
+    Connects (SSL or STARTTLS) and logs in on first use, then keeps the
+    session open until close() is called or the server drops it, in which
+    case the next send reconnects once.
+    """
+
+    def __init__(self, config):
+        self.server = config.get('MAIL_SERVER')
+        self.port = config.get('MAIL_PORT')
+        self.username = config.get('MAIL_USERNAME')
+        self.password = config.get('MAIL_PASSWORD')
+        self.use_tls = config.get('MAIL_USE_TLS')
+        self.use_ssl = config.get('MAIL_USE_SSL')
+        self._smtp = None
+        self.last_used = 0.0
+
+    def _connect(self):
+        if self.use_ssl:
+            smtp = smtplib.SMTP_SSL(self.server, self.port, context=ssl.create_default_context(), timeout=30)
+        else:
+            smtp = smtplib.SMTP(self.server, self.port, timeout=30)
+            if self.use_tls:
+                smtp.starttls(context=ssl.create_default_context())
+        if self.username:
+            smtp.login(self.username, self.password)
+        return smtp
+
+    def send(self, msg: EmailMessage) -> None:
+        import time as _time
+        if self._smtp is None:
+            self._smtp = self._connect()
+        try:
+            self._smtp.send_message(msg)
+        except (smtplib.SMTPServerDisconnected, ConnectionError, OSError):
+            # Server closed an idle session: reconnect once and retry
+            self.close()
+            self._smtp = self._connect()
+            self._smtp.send_message(msg)
+        self.last_used = _time.monotonic()
+
+    def close(self) -> None:
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
+
+def _send_smtp_now(to_email: str, subject: str, body: str) -> bool:
+    if not _smtp_settings_ok():
+        app.logger.warning('Email not sent: MAIL_* env vars not fully configured')
+        return False
+    conn = SMTPConnection(app.config)
+    try:
+        conn.send(_build_message(to_email, subject, body))
+        return True
+    except Exception as e:
+        app.logger.error(f"Failed to send email to {to_email}: {e}")
+        return False
+    finally:
+        conn.close()
+
+# Index of recently written outbox messages, so dev tooling can find the latest
+# message (and OTP) for a recipient without listing the outbox directory.
+# Latest entry per recipient is kept in memory (bounded LRU) and appended to
+# outbox/index.jsonl so other processes and restarts can still resolve it.
+# 'file' is the .eml name, or 'spool/<day>/<segment>:<offset>' in spool format.
+# The file is compacted to the newest entry per recipient (dropping entries
+# older than MAIL_SPOOL_RETENTION_DAYS) whenever it doubles past 8 MiB.
+import re
+from collections import OrderedDict
+
+_OTP_RE = re.compile(r'Your one-time password \(OTP\) is: (\d{6})')
+_OUTBOX_INDEX_MAX = 1024
+_OUTBOX_INDEX_COMPACT_BYTES = 8 * 1024 * 1024
+_outbox_index = OrderedDict()
+_outbox_index_lock = threading.Lock()
+_outbox_index_compacted_size = 0
+
+def _outbox_index_path() -> str:
+    return os.path.join(app.instance_path, 'outbox', 'index.jsonl')
+
+def _record_outbox_entry(to_email: str, filename: str, body: str) -> None:
+    import json as _json
+    m = _OTP_RE.search(body or '')
+    entry = {
+        'ts': datetime.utcnow().isoformat(),
+        'to': (to_email or '').strip().lower(),
+        'file': filename,
+        'otp': m.group(1) if m else None
+    }
+    with _outbox_index_lock:
+        _outbox_index[entry['to']] = entry
+        _outbox_index.move_to_end(entry['to'])
+        while len(_outbox_index) > _OUTBOX_INDEX_MAX:
+            _outbox_index.popitem(last=False)
+        try:
+            with open(_outbox_index_path(), 'a', encoding='utf-8') as f:
+                f.write(_json.dumps(entry) + '\n')
+                size = f.tell()
+            if size > max(_OUTBOX_INDEX_COMPACT_BYTES, 2 * _outbox_index_compacted_size):
+                _compact_outbox_index()
+        except Exception as e:
+            app.logger.warning(f"Failed to append outbox index: {e}")
+
+def _compact_outbox_index() -> None:
+    """Rewrite index.jsonl with only the newest entry per recipient. Call with _outbox_index_lock held."""
+    import json as _json
+    global _outbox_index_compacted_size
+    path = _outbox_index_path()
+    retention_days = app.config.get('MAIL_SPOOL_RETENTION_DAYS') or 0
+    cutoff = (datetime.utcnow() - timedelta(days=retention_days)).isoformat() if retention_days else ''
+    latest = OrderedDict()
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            try:
+                entry = _json.loads(line)
+            except ValueError:
+                continue
+            to = entry.get('to') if isinstance(entry, dict) else None
+            if to is None or (entry.get('ts') or '') < cutoff:
+                continue
+            latest.pop(to, None)
+            latest[to] = line if line.endswith('\n') else line + '\n'
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.writelines(latest.values())
+    # Appends by other processes between the read and the replace are lost;
+    # their in-process index still has them
+    os.replace(tmp, path)
+    _outbox_index_compacted_size = os.path.getsize(path)
+    app.logger.info(f"Compacted outbox index to {len(latest)} recipients")
+
+def latest_outbox_entry(to_email: str, chunk_bytes: int = 1 << 20):
+    """Return the newest index entry for a recipient, or None.
+
+    Checks the in-process index first, then scans outbox/index.jsonl backwards
+    in chunks (entries written by other processes), stopping at the first match.
+    """
+    import json as _json
+    key = (to_email or '').strip().lower()
+    with _outbox_index_lock:
+        entry = _outbox_index.get(key)
+    if entry:
+        return entry
+    needle = _json.dumps(key).encode('utf-8')
+    try:
+        with open(_outbox_index_path(), 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            carry = b''
+            while pos > 0:
+                start = max(0, pos - chunk_bytes)
+                f.seek(start)
+                lines = (f.read(pos - start) + carry).split(b'\n')
+                pos = start
+                # The first line may continue in the previous chunk
+                carry = lines.pop(0) if start > 0 else b''
+                for line in reversed(lines):
+                    if needle not in line:
+                        continue
+                    try:
+                        entry = _json.loads(line)
+                    except ValueError:
+                        continue
+                    if entry.get('to') == key:
+                        return entry
+    except OSError:
+        return None
+    return None
+
+_mail_spool = None
+_mail_spool_lock = threading.Lock()
+
+def _get_mail_spool():
+    global _mail_spool
+    with _mail_spool_lock:
+        if _mail_spool is None:
+            from mail_spool import MailSpool
+            _mail_spool = MailSpool(
+                os.path.join(app.instance_path, 'outbox', 'spool'),
+                max_segment_bytes=app.config['MAIL_SPOOL_SEGMENT_MB'] * 1024 * 1024,
+                compress=bool(app.config.get('MAIL_SPOOL_COMPRESS')),
+                retention_days=app.config['MAIL_SPOOL_RETENTION_DAYS']
+            )
+        return _mail_spool
+
 def send_email(to_email: str, subject: str, body: str) -> bool:
     mail_mode = (app.config.get('MAIL_MODE') or '').lower()
     mail_from = app.config.get('MAIL_FROM')
     mirror_file = bool(app.config.get('MAIL_MIRROR_FILE'))
 
     def _write_eml():
+        if app.config.get('MAIL_FILE_FORMAT') == 'spool':
+            return _write_spool()
         try:
             out_dir = os.path.join(app.instance_path, 'outbox')
             os.makedirs(out_dir, exist_ok=True)
@@ -197,12 +1108,28 @@ def send_email(to_email: str, subject: str, body: str) -> bool:
                 f.write(f"Subject: {subject}\n")
                 f.write("Content-Type: text/plain; charset=UTF-8\n\n")
                 f.write(body)
+            _record_outbox_entry(to_email, filename, body)
             app.logger.info(f"Email written to {path}")
             return True
         except Exception as e:
             app.logger.error(f"Failed to write email file: {e}")
             return False
 
+    def _write_spool():
+        try:
+            ref = _get_mail_spool().append({
+                'ts': datetime.utcnow().isoformat(),
+                'from': mail_from,
+                'to': to_email,
+                'subject': subject,
+                'body': body
+            })
+            _record_outbox_entry(to_email, f"spool/{ref}", body)
+            return True
+        except Exception as e:
+            app.logger.error(f"Failed to append email to spool: {e}")
+            return False
+
     # Development mode: only write to file
     if mail_mode == 'file':
         return _write_eml()
@@ -211,40 +1138,134 @@ def send_email(to_email: str, subject: str, body: str) -> bool:
     if mirror_file:
         _write_eml()
 
-    server = app.config.get('MAIL_SERVER')
-    username = app.config.get('MAIL_USERNAME')
-    password = app.config.get('MAIL_PASSWORD')
-    port = app.config.get('MAIL_PORT')
-    use_tls = app.config.get('MAIL_USE_TLS')
-    use_ssl = app.config.get('MAIL_USE_SSL')
-
-    if not (server and username and password and mail_from):
+    if not _smtp_settings_ok():
         app.logger.warning('Email not sent: MAIL_* env vars not fully configured')
         return False
 
-    msg = EmailMessage()
-    msg['Subject'] = subject
-    msg['From'] = mail_from
-    msg['To'] = to_email
-    msg.set_content(body)
+    if not app.config.get('MAIL_ASYNC'):
+        return _send_smtp_now(to_email, subject, body)
+    return enqueue_email(to_email, subject, body)
+
+# Background mail worker: request handlers only insert an OutboundEmail row;
+# a daemon thread per process claims due rows in batches and sends them over
+# one reused SMTP connection, retrying failures with exponential backoff.
+_mail_wakeup = threading.Event()
+_mail_worker_lock = threading.Lock()
+_mail_worker_thread = None
 
+def enqueue_email(to_email: str, subject: str, body: str) -> bool:
     try:
-        if use_ssl:
-            context = ssl.create_default_context()
-            with smtplib.SMTP_SSL(server, port, context=context) as smtp:
-                smtp.login(username, password)
-                smtp.send_message(msg)
-        else:
-            with smtplib.SMTP(server, port) as smtp:
-                if use_tls:
-                    context = ssl.create_default_context()
-                    smtp.starttls(context=context)
-                smtp.login(username, password)
-                smtp.send_message(msg)
-        return True
+        db.session.add(OutboundEmail(to_email=to_email, subject=subject, body=body))
+        db.session.commit()
     except Exception as e:
-        app.logger.error(f"Failed to send email to {to_email}: {e}")
+        db.session.rollback()
+        app.logger.error(f"Failed to queue email to {to_email}: {e}")
         return False
+    _ensure_mail_worker()
+    _mail_wakeup.set()
+    return True
+
+def _claim_mail_batch(limit: int):
+    """Atomically claim up to `limit` due messages for this worker."""
+    now = datetime.utcnow()
+    due_filter = (OutboundEmail.status == 'queued', OutboundEmail.next_attempt_at <= now)
+    # Read-only check first so an idle poll never takes SQLite's write lock
+    if db.session.query(OutboundEmail.id).filter(*due_filter).first() is None:
+        return []
+    token = secrets.token_hex(8)
+    due = (db.session.query(OutboundEmail.id).filter(*due_filter)
+           .order_by(OutboundEmail.id).limit(limit).scalar_subquery())
+    # The status guard makes the claim safe when several processes poll the same table
+    db.session.execute(
+        db.update(OutboundEmail)
+        .where(OutboundEmail.id.in_(due), OutboundEmail.status == 'queued')
+        .values(status='sending', claim_token=token,
+                next_attempt_at=now + timedelta(minutes=10))
+    )
+    db.session.commit()
+    return OutboundEmail.query.filter_by(status='sending', claim_token=token).order_by(OutboundEmail.id).all()
+
+def _release_stale_mail_claims() -> None:
+    """Requeue messages whose worker died mid-batch (claim older than 10 minutes)."""
+    stale = (OutboundEmail.status == 'sending', OutboundEmail.next_attempt_at <= datetime.utcnow())
+    if db.session.query(OutboundEmail.id).filter(*stale).first() is None:
+        return
+    db.session.execute(
+        db.update(OutboundEmail)
+        .where(*stale)
+        .values(status='queued', claim_token=None)
+    )
+    db.session.commit()
+
+def process_mail_queue(conn: SMTPConnection) -> int:
+    """Send one claimed batch over `conn`; returns how many messages were attempted."""
+    batch = _claim_mail_batch(app.config.get('MAIL_BATCH_SIZE', 50))
+    if not batch:
+        return 0
+    max_attempts = app.config.get('MAIL_MAX_ATTEMPTS', 5)
+    base_delay = app.config.get('MAIL_RETRY_BASE_SECONDS', 30)
+    for item in batch:
+        item.attempts += 1
+        item.claim_token = None
+        try:
+            conn.send(_build_message(item.to_email, item.subject, item.body))
+            item.status = 'sent'
+            item.sent_at = datetime.utcnow()
+            item.last_error = None
+        except Exception as e:
+            conn.close()
+            item.last_error = str(e)[:500]
+            if item.attempts >= max_attempts:
+                item.status = 'failed'
+                app.logger.error(f"Giving up on email {item.id} to {item.to_email}: {e}")
+            else:
+                item.status = 'queued'
+                delay = min(base_delay * (2 ** (item.attempts - 1)), 3600)
+                item.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+                app.logger.warning(f"Email {item.id} to {item.to_email} failed (attempt {item.attempts}), retrying in {delay}s: {e}")
+    db.session.commit()
+    return len(batch)
+
+def _mail_worker_loop() -> None:
+    import time as _time
+    conn = SMTPConnection(app.config)
+    last_release = 0.0
+    while True:
+        _mail_wakeup.clear()
+        try:
+            with app.app_context():
+                if _time.monotonic() - last_release > 60:
+                    _release_stale_mail_claims()
+                    last_release = _time.monotonic()
+                while process_mail_queue(conn):
+                    pass
+        except Exception as e:
+            app.logger.error(f"Mail worker error: {e}")
+        if conn.last_used and _time.monotonic() - conn.last_used > app.config.get('MAIL_SMTP_IDLE_SECONDS', 60):
+            conn.close()
+            conn.last_used = 0.0
+        _mail_wakeup.wait(app.config.get('MAIL_POLL_SECONDS', 5))
+
+def _ensure_mail_worker() -> None:
+    global _mail_worker_thread
+    with _mail_worker_lock:
+        if _mail_worker_thread is None or not _mail_worker_thread.is_alive():
+            _mail_worker_thread = threading.Thread(target=_mail_worker_loop, name='mail-worker', daemon=True)
+            _mail_worker_thread.start()
+
+def start_mail_worker() -> bool:
+    """Start this process's mail worker when queued SMTP sending is configured.
+
+    Called once per serving process at startup, so rows queued or waiting on a
+    retry before a restart are sent without waiting for the next enqueue_email().
+    """
+    if (app.config.get('MAIL_MODE') or '').lower() == 'file' or not app.config.get('MAIL_ASYNC'):
+        return False
+    if not _smtp_settings_ok():
+        return False
+    _ensure_mail_worker()
+    _mail_wakeup.set()
+    return True
 
 # Token utilities for email verification
 from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
@@ -253,6 +1274,149 @@ def _get_serializer():
     key = app.config['SECRET_KEY']
     return URLSafeTimedSerializer(key, salt='edureach-email-verify')
 
+def _get_token_serializer():
+    return URLSafeTimedSerializer(app.config['SECRET_KEY'], salt='edureach-api-token')
+
+def issue_api_token(user) -> str:
+    return _get_token_serializer().dumps({
+        'id': user.id,
+        'cls': user.class_level,
+        'adm': bool(getattr(user, 'is_admin', False))
+    })
+
+@login_manager.request_loader
+def load_user_from_token(req):
+    # Only consulted when the session has no logged-in user. Tokens authenticate
+    # the JSON API only; HTML pages and /admin routes need a session login.
+    if not app.config.get('API_TOKENS') or not req.path.startswith('/api/'):
+        return None
+    auth = req.headers.get('Authorization', '')
+    if not auth.startswith('Bearer '):
+        return None
+    try:
+        data = _get_token_serializer().loads(auth[7:].strip(), max_age=app.config['API_TOKEN_TTL_SECONDS'])
+    except (BadSignature, SignatureExpired):
+        return None
+    try:
+        return UserSnapshot(int(data['id']), None, None, data.get('cls'), bool(data.get('adm')), True)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+# Hashing policy: passwords go through the configured (deliberately slow) KDF;
+# 6-digit OTPs live for minutes and are checked once, so they get a keyed
+# HMAC bound to the user id instead of a full KDF run per login.
+import hmac
+import hashlib
+
+_password_method_prefix = {}
+
+class HashPoolBusy(Exception):
+    pass
+
+_hash_pool = None
+_hash_pool_slots = None
+_hash_pool_lock = threading.Lock()
+
+def _get_hash_pool():
+    global _hash_pool, _hash_pool_slots
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            workers = app.config['HASH_POOL_WORKERS']
+            pending = app.config['HASH_POOL_MAX_PENDING'] or workers * 4
+            _hash_pool = ProcessPoolExecutor(max_workers=workers)
+            _hash_pool_slots = threading.BoundedSemaphore(workers + pending)
+        return _hash_pool, _hash_pool_slots
+
+def _run_hash(fn, *args):
+    # Werkzeug's hash functions are plain module-level callables, so they pickle
+    # straight into the worker processes without importing this app there.
+    if app.config.get('HASH_POOL_WORKERS', 0) <= 0:
+        return fn(*args)
+    pool, slots = _get_hash_pool()
+    if not slots.acquire(blocking=False):
+        raise HashPoolBusy()
+    try:
+        future = pool.submit(fn, *args)
+    except Exception:
+        slots.release()
+        raise
+    future.add_done_callback(lambda f: slots.release())
+    # Only an alias of the builtin TimeoutError from Python 3.11 on
+    from concurrent.futures import TimeoutError as _FutureTimeout
+    try:
+        return future.result(timeout=app.config['HASH_POOL_TIMEOUT_SECONDS'])
+    except _FutureTimeout:
+        raise HashPoolBusy()
+
+@app.errorhandler(HashPoolBusy)
+def _hash_pool_busy(e):
+    app.logger.warning('Hash pool saturated; rejecting request with 503')
+    msg = 'Server is busy, please try again in a moment'
+    if request.is_json:
+        resp = jsonify({'success': False, 'message': msg})
+    else:
+        resp = app.response_class(msg, mimetype='text/plain')
+    resp.status_code = 503
+    resp.headers['Retry-After'] = str(app.config['HASH_POOL_RETRY_AFTER'])
+    return resp
+
+def hash_password(password: str) -> str:
+    return _run_hash(generate_password_hash, password, app.config['PASSWORD_HASH_METHOD'])
+
+def verify_password(stored_hash: str, password: str) -> bool:
+    if not stored_hash or password is None:
+        return False
+    return _run_hash(check_password_hash, stored_hash, password)
+
+def password_needs_rehash(stored_hash: str) -> bool:
+    method = app.config['PASSWORD_HASH_METHOD']
+    prefix = _password_method_prefix.get(method)
+    if prefix is None:
+        # Let Werkzeug expand shorthand like 'scrypt' to its full parameter string
+        prefix = generate_password_hash('', method=method).split('$', 1)[0]
+        _password_method_prefix[method] = prefix
+    return (stored_hash or '').split('$', 1)[0] != prefix
+
+def _otp_key() -> bytes:
+    key = app.config.get('OTP_HMAC_KEY')
+    if key:
+        return key.encode('utf-8')
+    return hashlib.sha256(('edureach-otp:' + app.config['SECRET_KEY']).encode('utf-8')).digest()
+
+def hash_otp(user_id: int, code: str) -> str:
+    digest = hmac.new(_otp_key(), f"{user_id}:{code}".encode('utf-8'), hashlib.sha256).hexdigest()
+    return f"hmac-sha256${digest}"
+
+def verify_otp_code(stored_hash: str, user_id: int, code: str) -> bool:
+    if not stored_hash or not code:
+        return False
+    if stored_hash.startswith('hmac-sha256$'):
+        return hmac.compare_digest(stored_hash, hash_otp(user_id, code))
+    # OTPs issued before the HMAC switch still carry a Werkzeug hash
+    return _run_hash(check_password_hash, stored_hash, code)
+
+_otp_store = None
+_otp_store_lock = threading.Lock()
+
+def get_otp_store():
+    global _otp_store
+    with _otp_store_lock:
+        if _otp_store is None:
+            from otp_store import MemoryOTPStore, SQLiteOTPStore
+            if app.config['OTP_STORE'] == 'memory':
+                _otp_store = MemoryOTPStore()
+            else:
+                path = app.config['OTP_STORE_PATH'] or os.path.join(app.instance_path, 'otp.db')
+                _otp_store = SQLiteOTPStore(path)
+            _otp_store.start_sweeper(app.config['OTP_SWEEP_SECONDS'])
+        return _otp_store
+
+def _issue_otp(user_id: int) -> str:
+    otp_value = f"{secrets.randbelow(1000000):06d}"
+    get_otp_store().put(user_id, hash_otp(user_id, otp_value), app.config['OTP_TTL_SECONDS'])
+    return otp_value
+
 # Helper for building absolute URLs in emails that work across devices/LAN
 from typing import Any
 
@@ -321,7 +1485,7 @@ def login():
         
         student = Student.query.filter_by(email=email).first()
         
-        if student and check_password_hash(student.password_hash, password):
+        if student and verify_password(student.password_hash, password):
             # Enforce role selection for clarity
             if role == 'admin' and not getattr(student, 'is_admin', False):
                 msg = 'This account is not an admin. Use "Login as Student".'
@@ -343,12 +1507,15 @@ def login():
                 flash(msg)
                 return render_template('auth/login.html')
             # Step 1 passed: password verified and email verified. Generate and send OTP, require verification.
-            otp_value = f"{secrets.randbelow(1000000):06d}"
-            from werkzeug.security import generate_password_hash as _gph
-            otp_hash = _gph(otp_value)
-            PendingOTP.query.filter_by(user_id=student.id).delete()
-            db.session.add(PendingOTP(user_id=student.id, otp_hash=otp_hash, expires_at=datetime.utcnow() + timedelta(minutes=5)))
-            db.session.commit()
+            if password_needs_rehash(student.password_hash):
+                # Upgrade to the current hashing policy while we have the plaintext;
+                # during a burst the upgrade waits for a later login
+                try:
+                    student.password_hash = hash_password(password)
+                    db.session.commit()
+                except HashPoolBusy:
+                    pass
+            otp_value = _issue_otp(student.id)
             session['pending_user_id'] = student.id
             send_email(
                 to_email=student.email,
@@ -387,7 +1554,7 @@ def register():
             name=name,
             email=email,
             class_level=class_level,
-            password_hash=generate_password_hash(password),
+            password_hash=hash_password(password),
             email_verified=False
         )
         
@@ -413,6 +1580,19 @@ def logout():
     logout_user()
     return redirect(url_for('home'))
 
+@app.route('/api/token', methods=['POST'])
+@login_required
+def api_token():
+    # Issue a fresh bearer token for the session user, or refresh an unexpired token.
+    # Claims come from the database, not the presented token, so a refresh picks
+    # up demotions, class changes and deleted accounts.
+    if not app.config.get('API_TOKENS'):
+        return jsonify({'success': False, 'message': 'API tokens are disabled'}), 404
+    student = db.session.get(Student, current_user.id)
+    if student is None or not student.email_verified:
+        return jsonify({'success': False, 'message': 'Account not available'}), 401
+    return jsonify({'success': True, 'token': issue_api_token(student), 'expires_in': app.config['API_TOKEN_TTL_SECONDS']})
+
 @app.route('/verify-email')
 def verify_email():
     token = request.args.get('token', '')
@@ -439,6 +1619,7 @@ def verify_email():
     student.email_verified = True
     db.session.add(student)
     db.session.commit()
+    invalidate_user_cache(student.id)
 
     # Optional: send a welcome confirmation upon successful verification
     try:
@@ -485,12 +1666,7 @@ def auth_resend_otp():
     if now - last < 30:
         return jsonify({'success': False, 'message': 'Please wait before requesting another OTP'}), 429
     # Generate and send OTP
-    otp_value = f"{secrets.randbelow(1000000):06d}"
-    from werkzeug.security import generate_password_hash as _gph
-    otp_hash = _gph(otp_value)
-    PendingOTP.query.filter_by(user_id=student.id).delete()
-    db.session.add(PendingOTP(user_id=student.id, otp_hash=otp_hash, expires_at=datetime.utcnow() + timedelta(minutes=5)))
-    db.session.commit()
+    otp_value = _issue_otp(student.id)
     session['last_otp_sent_ts'] = now
     send_email(student.email, 'Your EduReach login OTP', f"Hello {student.name},\n\nYour one-time password (OTP) is: {otp_value}\nIt will expire in 5 minutes.\n\n- EduReach")
     return jsonify({'success': True, 'message': 'OTP resent'})
@@ -522,12 +1698,7 @@ def dev_send_otp():
         return jsonify({'success': False, 'message': 'Account not found'}), 404
     if not getattr(student, 'email_verified', False):
         return jsonify({'success': False, 'message': 'Email not verified'}), 400
-    otp_value = f"{secrets.randbelow(1000000):06d}"
-    from werkzeug.security import generate_password_hash as _gph
-    otp_hash = _gph(otp_value)
-    PendingOTP.query.filter_by(user_id=student.id).delete()
-    db.session.add(PendingOTP(user_id=student.id, otp_hash=otp_hash, expires_at=datetime.utcnow() + timedelta(minutes=5)))
-    db.session.commit()
+    otp_value = _issue_otp(student.id)
     send_email(student.email, 'Your EduReach login OTP', f"Hello {student.name},\n\nYour one-time password (OTP) is: {otp_value}\nIt will expire in 5 minutes.\n\n- EduReach")
     return jsonify({'success': True, 'message': 'OTP sent'})
 
@@ -539,28 +1710,17 @@ def dev_current_otp():
     if not pending_user_id:
         return jsonify({'success': False, 'message': 'No pending OTP session'})
     
-    # Get the most recent email file
-    import os
-    outbox_dir = os.path.join(app.instance_path, 'outbox')
-    try:
-        files = [f for f in os.listdir(outbox_dir) if f.endswith('.eml')]
-        if not files:
-            return jsonify({'success': False, 'message': 'No email files found'})
-        
-        latest_file = max(files, key=lambda f: os.path.getmtime(os.path.join(outbox_dir, f)))
-        with open(os.path.join(outbox_dir, latest_file), 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Extract OTP from email content
-        import re
-        otp_match = re.search(r'Your one-time password \(OTP\) is: (\d{6})', content)
-        if otp_match:
-            otp_code = otp_match.group(1)
-            return jsonify({'success': True, 'otp': otp_code, 'file': latest_file})
-        else:
-            return jsonify({'success': False, 'message': 'OTP not found in email'})
-    except Exception as e:
-        return jsonify({'success': False, 'message': f'Error: {e}'})
+    student = Student.query.get(pending_user_id)
+    if not student:
+        return jsonify({'success': False, 'message': 'User not found'})
+
+    # Latest outbox message for this user's address, via the outbox index
+    entry = latest_outbox_entry(student.email)
+    if not entry:
+        return jsonify({'success': False, 'message': 'No email files found'})
+    if entry.get('otp'):
+        return jsonify({'success': True, 'otp': entry['otp'], 'file': entry.get('file')})
+    return jsonify({'success': False, 'message': 'OTP not found in email'})
 
 @app.route('/verify-otp', methods=['GET', 'POST'])
 def verify_otp():
@@ -573,40 +1733,55 @@ def verify_otp():
                 return jsonify({'success': False, 'message': 'No pending OTP session'}), 400
             flash('No pending OTP session')
             return redirect(url_for('login'))
-        # Fetch pending OTP record
-        pending = PendingOTP.query.filter_by(user_id=pending_user_id).first()
+        # Fetch pending OTP entry
+        import time as _time
+        store = get_otp_store()
+        pending = store.get(pending_user_id)
         if not pending:
             if request.is_json:
                 return jsonify({'success': False, 'message': 'OTP expired or not found'}), 400
             flash('OTP expired or not found')
             return redirect(url_for('login'))
         # Validate expiry
-        if datetime.utcnow() > pending.expires_at:
-            db.session.delete(pending)
-            db.session.commit()
+        if _time.time() > pending.expires_at:
+            store.delete(pending_user_id)
             if request.is_json:
                 return jsonify({'success': False, 'message': 'OTP expired'}), 400
             flash('OTP expired')
             return redirect(url_for('login'))
         # Validate code
-        from werkzeug.security import check_password_hash as _cph
         app.logger.info(f"OTP Verification - Received code: '{code}', Length: {len(code) if code else 0}")
-        app.logger.info(f"OTP Verification - User ID: {pending_user_id}, Expires: {pending.expires_at}")
-        if not code or not _cph(pending.otp_hash, code):
+        app.logger.info(f"OTP Verification - User ID: {pending_user_id}, Attempts: {pending.attempts}")
+        if not code or not verify_otp_code(pending.otp_hash, pending_user_id, code):
             app.logger.warning(f"OTP Verification FAILED for user {pending_user_id}")
+            if store.record_failure(pending_user_id) >= app.config['OTP_MAX_ATTEMPTS']:
+                # Too many guesses: burn the code so the user has to log in again
+                store.delete(pending_user_id)
+                if request.is_json:
+                    return jsonify({'success': False, 'message': 'Too many attempts. Please log in again.'}), 400
+                flash('Too many attempts. Please log in again.')
+                return redirect(url_for('login'))
             if request.is_json:
                 return jsonify({'success': False, 'message': 'Invalid OTP'}), 400
             flash('Invalid OTP')
             return render_template('auth/verify_otp.html')
+        # Consume the code; a concurrent request that already used it loses here
+        if not store.delete(pending_user_id):
+            if request.is_json:
+                return jsonify({'success': False, 'message': 'OTP expired or not found'}), 400
+            flash('OTP expired or not found')
+            return redirect(url_for('login'))
         # Success: login user
         user = Student.query.get(pending_user_id)
-        db.session.delete(pending)
-        db.session.commit()
         session.pop('pending_user_id', None)
         if user:
             login_user(user)
             if request.is_json:
-                return jsonify({'success': True, 'message': 'Login successful', 'is_admin': bool(getattr(user, 'is_admin', False))})
+                payload = {'success': True, 'message': 'Login successful', 'is_admin': bool(getattr(user, 'is_admin', False))}
+                if app.config.get('API_TOKENS'):
+                    payload['token'] = issue_api_token(user)
+                    payload['expires_in'] = app.config['API_TOKEN_TTL_SECONDS']
+                return jsonify(payload)
             if getattr(user, 'is_admin', False):
                 return redirect(url_for('admin_dashboard'))
             return redirect(url_for('dashboard'))
@@ -624,31 +1799,75 @@ def dashboard():
     # If admin accidentally visits student dashboard, send to admin dashboard
     if getattr(current_user, 'is_admin', False):
         return redirect(url_for('admin_dashboard'))
-    return render_template('dashboard.html')
+    return render_template('dashboard.html', summary=get_student_summary(current_user.id))
 
 @app.route('/courses')
 @login_required
+@use_read_replica
 def courses():
-    # Get all courses grouped by class and subject
-    courses = Course.query.all()
+    # Get all courses grouped by class and subject; videos in one extra query, not one per course
+    from sqlalchemy.orm import selectinload
+    courses = Course.query.options(selectinload(Course.videos)).all()
     return render_template('courses.html', courses=courses)
 
-@app.route('/api/courses')
-@login_required
-def api_courses():
-    # Get all courses
-    courses = Course.query.all()
-    
-    # Check for filter parameters in the query string
-    class_filter = request.args.get('class')
-    subject_filter = request.args.get('subject')
-    
-    # Apply filters if provided
+# Course catalog cache: serialized /api/courses payloads keyed by filter.
+# The catalog only changes through admin uploads and the seeding scripts, which
+# call invalidate_catalog_cache() (or touch the stamp file when they run outside
+# the app) so every worker process drops its copy. Least recently used entries
+# are evicted past _CATALOG_CACHE_MAX, so one-off filters never flush hot ones.
+_CATALOG_CACHE_MAX = 256
+_CATALOG_PAGE_MAX = 500
+_catalog_cache = OrderedDict()
+_catalog_cache_lock = threading.Lock()
+
+def _catalog_stamp_path() -> str:
+    return os.path.join(app.instance_path, 'catalog.stamp')
+
+def _catalog_stamp() -> int:
+    try:
+        return os.stat(_catalog_stamp_path()).st_mtime_ns
+    except OSError:
+        return 0
+
+def invalidate_catalog_cache() -> None:
+    with _catalog_cache_lock:
+        _catalog_cache.clear()
+    try:
+        path = _catalog_stamp_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'a'):
+            pass
+        os.utime(path, None)
+    except Exception as e:
+        app.logger.warning(f"Failed to touch catalog stamp: {e}")
+
+def _build_catalog_payload(class_filter, subject_filter, limit, after_id):
+    import json as _json
+    import hashlib
+    from sqlalchemy import func
+    from sqlalchemy.orm import selectinload
+    # Videos for the whole page come back in one extra query
+    query = Course.query.options(selectinload(Course.videos))
+
+    # Apply filters in SQL so only matching rows are loaded
     if class_filter:
-        courses = [c for c in courses if c.class_level == class_filter]
+        query = query.filter(Course.class_level == class_filter)
     if subject_filter:
-        courses = [c for c in courses if (c.subject or '').lower() == subject_filter.lower()]
-    
+        query = query.filter(func.lower(Course.subject) == subject_filter.lower())
+
+    # Optional keyset pagination: ?limit=N&after_id=<last id of previous page>
+    if after_id is not None:
+        query = query.filter(Course.id > after_id)
+    query = query.order_by(Course.id)
+    if limit is not None:
+        # Fetch one extra row to know whether another page exists
+        courses = query.limit(limit + 1).all()
+        has_more = len(courses) > limit
+        courses = courses[:limit]
+    else:
+        courses = query.all()
+        has_more = False
+
     # Organize courses by class and subject
     result = []
     for course in courses:
@@ -661,11 +1880,57 @@ def api_courses():
             'videos': course.get_videos()
         }
         result.append(course_data)
-    
-    return jsonify(result)
+
+    body = _json.dumps(result, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    etag = hashlib.sha1(body).hexdigest()
+    next_after_id = result[-1]['id'] if (has_more and result) else None
+    return body, etag, next_after_id
+
+@app.route('/api/courses')
+@login_required
+@use_read_replica
+def api_courses():
+    # Check for filter parameters in the query string
+    class_filter = request.args.get('class') or None
+    subject_filter = request.args.get('subject') or None
+    limit = request.args.get('limit', type=int)
+    after_id = request.args.get('after_id', type=int)
+    if limit is not None and limit <= 0:
+        return jsonify({'success': False, 'message': 'limit must be a positive integer'}), 400
+    # Normalise paging so equivalent requests share one cache entry: ids start
+    # at 1, so after_id <= 0 is no cursor, and pages are capped at _CATALOG_PAGE_MAX
+    if limit is not None:
+        limit = min(limit, _CATALOG_PAGE_MAX)
+    if after_id is not None and after_id <= 0:
+        after_id = None
+
+    key = (class_filter, (subject_filter or '').lower() or None, limit, after_id)
+    stamp = _catalog_stamp()
+    with _catalog_cache_lock:
+        entry = _catalog_cache.get(key)
+        if entry is not None:
+            _catalog_cache.move_to_end(key)
+    if entry is None or entry[0] != stamp:
+        body, etag, next_after_id = _build_catalog_payload(class_filter, subject_filter, limit, after_id)
+        entry = (stamp, body, etag, next_after_id)
+        with _catalog_cache_lock:
+            _catalog_cache[key] = entry
+            _catalog_cache.move_to_end(key)
+            while len(_catalog_cache) > _CATALOG_CACHE_MAX:
+                _catalog_cache.popitem(last=False)
+    _, body, etag, next_after_id = entry
+
+    resp = app.response_class(body, mimetype='application/json')
+    resp.set_etag(etag)
+    resp.headers['Cache-Control'] = 'private, no-cache'
+    if next_after_id is not None:
+        # Body stays a plain list for existing clients; the cursor travels in a header
+        resp.headers['X-Next-After-Id'] = str(next_after_id)
+    return resp.make_conditional(request)
 
 @app.route('/assignments')
 @login_required
+@use_read_replica
 def assignments():
     # Show assignments without referencing courses
     assignments = Assignment.query.all()
@@ -673,6 +1938,7 @@ def assignments():
 
 @app.route('/api/assignments')
 @login_required
+@use_read_replica
 def api_assignments():
     assignments = Assignment.query.all()
     return jsonify([{
@@ -684,6 +1950,7 @@ def api_assignments():
 
 @app.route('/api/assignment/<int:assignment_id>/questions')
 @login_required
+@use_read_replica
 def api_assignment_questions(assignment_id):
     import json as _json
     a = Assignment.query.get(assignment_id)
@@ -697,6 +1964,90 @@ def api_assignment_questions(assignment_id):
         parsed = []
     return jsonify({'success': True, 'questions': parsed})
 
+# Compiled answer keys: the packed correct answer per question, so grading
+# never re-parses Assignment.questions. Entries are checked against
+# Assignment.updated_at and dropped by invalidate_answer_keys() on reseeding.
+from collections import namedtuple
+
+# compiled=True: every key is a single character (or blank), so answers are
+# packed one byte per question and graded bytewise. Otherwise (e.g. "True",
+# "42") grading falls back to comparing the normalized full strings in texts.
+AnswerKey = namedtuple('AnswerKey', ['updated_at', 'is_mcq', 'answers', 'total', 'compiled', 'texts'])
+_answer_keys = {}
+_answer_keys_lock = threading.Lock()
+
+def invalidate_answer_keys(assignment_id=None) -> None:
+    with _answer_keys_lock:
+        if assignment_id is None:
+            _answer_keys.clear()
+        else:
+            _answer_keys.pop(assignment_id, None)
+
+def _normalize_answer(a) -> str:
+    return a.strip().lower() if isinstance(a, str) else ''
+
+def _packable(text: str) -> bool:
+    return len(text) <= 1 and (not text or ord(text) < 256)
+
+def pack_answers(answers, total: int) -> bytes:
+    """Pack MCQ answers into one byte per question.
+
+    A single-character answer is stored as its code point; blanks, longer
+    strings and non-strings become 0, which never counts as correct. Only
+    used for keys whose answers are all single characters (AnswerKey.compiled).
+    """
+    out = bytearray(total)
+    for i, a in enumerate(answers[:total]):
+        a = _normalize_answer(a)
+        if a and _packable(a):
+            out[i] = ord(a)
+    return bytes(out)
+
+def _compile_answer_key(questions_text, updated_at) -> AnswerKey:
+    import json as _json
+    try:
+        parsed = _json.loads(questions_text) if questions_text else None
+    except Exception:
+        parsed = None
+    if isinstance(parsed, list) and all(isinstance(x, dict) for x in parsed):
+        texts = tuple(_normalize_answer(str(q.get('answer') or '')) for q in parsed)
+        if all(_packable(t) for t in texts):
+            return AnswerKey(updated_at, True, pack_answers(list(texts), len(texts)), len(texts), True, texts)
+        return AnswerKey(updated_at, True, b'', len(texts), False, texts)
+    return AnswerKey(updated_at, False, b'', 0, False, ())
+
+def get_answer_key(assignment_id):
+    """Return the compiled AnswerKey for an assignment, or None if it does not exist."""
+    row = db.session.query(Assignment.updated_at).filter(Assignment.id == assignment_id).first()
+    if row is None:
+        return None
+    updated_at = row[0]
+    with _answer_keys_lock:
+        key = _answer_keys.get(assignment_id)
+    if key is None or key.updated_at != updated_at:
+        questions = db.session.query(Assignment.questions).filter(Assignment.id == assignment_id).scalar()
+        key = _compile_answer_key(questions, updated_at)
+        with _answer_keys_lock:
+            _answer_keys[assignment_id] = key
+    return key
+
+def grade_mcq(key: AnswerKey, packed: bytes) -> int:
+    """Count packed answers matching a compiled key."""
+    correct = 0
+    for expected, given in zip(key.answers, packed):
+        if expected and expected == given:
+            correct += 1
+    return correct
+
+def grade_mcq_text(key: AnswerKey, answers) -> int:
+    """Count answers matching the key by normalized full string (uncompiled keys)."""
+    correct = 0
+    for expected, given in zip(key.texts, answers):
+        given = _normalize_answer(given)
+        if given and given == expected:
+            correct += 1
+    return correct
+
 @app.route('/api/submit_assignment', methods=['POST'])
 @login_required
 def submit_assignment():
@@ -705,27 +2056,28 @@ def submit_assignment():
     assignment_id = data.get('assignment_id')
     answers = data.get('answers') or []
 
-    assignment = Assignment.query.get(assignment_id)
-    if not assignment:
+    key = get_answer_key(assignment_id)
+    if key is None:
         return jsonify({'success': False, 'message': 'Assignment not found'})
+    course_id = db.session.query(Assignment.course_id).filter(Assignment.id == assignment_id).scalar()
+    if course_id is None:
+        return jsonify({'success': False, 'message': 'Assignment is not linked to a course'})
 
     # Determine scoring strategy: MCQ JSON vs free-text
     score = 0
-    try:
-        parsed = _json.loads(assignment.questions) if assignment.questions else None
-    except Exception:
-        parsed = None
-
     correct = None
     total = None
-    if isinstance(parsed, list) and all(isinstance(x, dict) for x in parsed):
+    packed = None
+    raw = None
+    if key.is_mcq:
         # MCQ: compare letter keys
-        total = len(parsed)
-        correct = 0
-        for i, q in enumerate(parsed):
-            ans_letter = (answers[i] if i < len(answers) else '').strip().lower()
-            if ans_letter and q.get('answer', '').strip().lower() == ans_letter:
-                correct += 1
+        total = key.total
+        if key.compiled:
+            packed = pack_answers(answers, total)
+            correct = grade_mcq(key, packed)
+        else:
+            correct = grade_mcq_text(key, answers)
+            raw = _json.dumps([a if isinstance(a, str) else '' for a in answers[:total]])
         score = int(round((correct / total) * 100)) if total else 0
     else:
         # Free-text fallback: keep previous simple scoring (presence-based)
@@ -740,14 +2092,33 @@ def submit_assignment():
     if not progress:
         progress = Progress(
             student_id=current_user.id,
+            course_id=course_id,
             assignment_id=assignment_id
         )
 
+    # A resubmission replaces the previous score in the summary
+    was_completed = bool(progress.completed)
+    old_score = (progress.score or 0.0) if was_completed else 0.0
+
     progress.score = score
+    # Keep the raw MCQ answers so the submission can be regraded later
+    progress.answers_packed = packed
+    progress.answers_json = raw
     progress.completed = True
     progress.completed_at = datetime.utcnow()
 
     db.session.add(progress)
+    db.session.flush()
+    course = (db.session.query(Course.class_level, Course.subject)
+              .join(Assignment, Assignment.course_id == Course.id)
+              .filter(Assignment.id == assignment_id).first())
+    class_level, subject = course if course else (None, None)
+    apply_summary_deltas(current_user.id, {subject: {
+        'assignments': 0 if was_completed else 1,
+        'score_total': score - old_score,
+    }}, at=progress.completed_at)
+    record_progress_event(current_user.id, 'assignment', class_level, subject,
+                          assignment_id=assignment_id, score=score, created_at=progress.completed_at)
     db.session.commit()
 
     resp = {'success': True, 'score': progress.score}
@@ -755,44 +2126,141 @@ def submit_assignment():
         resp.update({'correct': correct, 'total': total})
     return jsonify(resp)
 
+def regrade_assignment(assignment_id, batch_size: int = 5000) -> dict:
+    """Rescore every stored MCQ submission of an assignment against its current key.
+
+    Submissions are loaded into a (students x questions) uint8 matrix and
+    scored in one vectorized pass; only changed scores are written back, in
+    batched UPDATEs.
+    """
+    import json as _json
+    import numpy as np
+    invalidate_answer_keys(assignment_id)
+    key = get_answer_key(assignment_id)
+    if key is None:
+        raise ValueError(f'Assignment {assignment_id} not found')
+    if not key.is_mcq or not key.total:
+        return {'assignment_id': assignment_id, 'submissions': 0, 'updated': 0}
+
+    rows = (db.session.query(Progress.id, Progress.answers_packed, Progress.score, Progress.student_id,
+                             Progress.completed_at, Progress.answers_json)
+            .filter(Progress.assignment_id == assignment_id,
+                    db.or_(Progress.answers_packed.isnot(None), Progress.answers_json.isnot(None)))
+            .all())
+    if not rows:
+        return {'assignment_id': assignment_id, 'submissions': 0, 'updated': 0}
+
+    total = key.total
+    if key.compiled:
+        # Submissions made against an uncompiled key kept their raw answers; pack them
+        # now. Pad/truncate each submission to the key length so the buffer reshapes cleanly
+        packed = [r[1] if r[1] is not None else pack_answers(_json.loads(r[5]), total) for r in rows]
+        buf = b''.join(p[:total].ljust(total, b'\0') for p in packed)
+        matrix = np.frombuffer(buf, dtype=np.uint8).reshape(len(rows), total)
+        expected = np.frombuffer(key.answers, dtype=np.uint8)
+        correct = ((matrix == expected) & (expected != 0)).sum(axis=1)
+    else:
+        # Multi-character answers: compare as strings, using the stored letters of
+        # submissions made while the key was still compiled
+        answers = [_json.loads(r[5]) if r[5] is not None else [chr(b) if b else '' for b in r[1][:total]]
+                   for r in rows]
+        correct = np.fromiter((grade_mcq_text(key, a) for a in answers), dtype=np.int64, count=len(rows))
+    # np.rint rounds half to even, same as round() in submit_assignment
+    scores = np.rint(correct * 100.0 / total)
+
+    ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    old = np.fromiter(((r[2] if r[2] is not None else -1.0) for r in rows), dtype=np.float64, count=len(rows))
+    changed = np.nonzero(scores != old)[0]
+    # Correct the hourly/daily score totals already rolled up: one score_adjust
+    # event per changed score, dated like the submission it corrects. Submissions
+    # older than the event log were never rolled up and get none.
+    course = (db.session.query(Course.class_level, Course.subject)
+              .join(Assignment, Assignment.course_id == Course.id)
+              .filter(Assignment.id == assignment_id).first())
+    class_level, subject = course if course else (None, None)
+    first_event_at = db.session.query(db.func.min(ProgressEvent.created_at)).scalar()
+    for start in range(0, len(changed), batch_size):
+        chunk = changed[start:start + batch_size]
+        db.session.execute(
+            db.update(Progress),
+            [{'id': int(ids[i]), 'score': float(scores[i])} for i in chunk]
+        )
+        adjustments = [{
+            'student_id': rows[i][3], 'kind': 'score_adjust', 'assignment_id': assignment_id,
+            'score': float(scores[i]) - max(float(old[i]), 0.0),
+            'class_level': class_level, 'subject': _summary_subject(subject), 'created_at': rows[i][4],
+        } for i in chunk if first_event_at is not None and rows[i][4] is not None and rows[i][4] >= first_event_at]
+        if adjustments:
+            db.session.execute(db.insert(ProgressEvent), adjustments)
+        db.session.commit()
+    if len(changed):
+        rebuild_student_summaries({rows[i][3] for i in changed})
+        db.session.commit()
+    return {'assignment_id': assignment_id, 'submissions': len(rows), 'updated': int(len(changed))}
+
+@app.route('/admin/assignments/<int:assignment_id>/regrade', methods=['POST'])
+@admin_required
+def admin_regrade_assignment(assignment_id):
+    try:
+        result = regrade_assignment(assignment_id)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 404
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"Regrade of assignment {assignment_id} failed: {e}")
+        return jsonify({'success': False, 'message': f'Regrade failed: {e}'}), 500
+    return jsonify({'success': True, **result})
+
+@app.route('/admin/cache-stats')
+@admin_required
+def admin_cache_stats():
+    return jsonify({'success': True, 'user_cache': user_cache_stats()})
+
 @app.route('/progress')
 @login_required
+@use_read_replica
 def progress():
     student_progress = Progress.query.filter_by(student_id=current_user.id).all()
-    return render_template('progress.html', progress_data=student_progress)
+    return render_template('progress.html', progress_data=student_progress,
+                           summary=get_student_summary(current_user.id))
+
+@app.route('/api/progress/summary')
+@login_required
+@use_read_replica
+def api_progress_summary():
+    return jsonify(get_student_summary(current_user.id))
 
 @app.route('/api/progress')
 @login_required
+@use_read_replica
 def api_progress():
     student_progress = Progress.query.filter_by(student_id=current_user.id).all()
-    import json as _json
     return jsonify([{
         'course_id': p.course_id,
         'assignment_id': p.assignment_id,
         'score': p.score,
         'completed': p.completed,
         'completed_at': p.completed_at.isoformat() if p.completed_at else None,
-        'video_progress': (
-            _json.loads(p.video_progress).get('completed', []) if p.video_progress else []
-        )
+        'video_progress': p.completed_videos()
     } for p in student_progress])
 
 @app.route('/api/progress/course/<int:course_id>')
 @login_required
+@use_read_replica
 def api_progress_course(course_id):
-    import json as _json
-    p = Progress.query.filter_by(student_id=current_user.id, course_id=course_id).first()
+    p = Progress.query.filter_by(student_id=current_user.id, course_id=course_id, assignment_id=None).first()
     if not p:
         return jsonify({'course_id': course_id, 'video_progress': [], 'completed': False})
     return jsonify({
         'course_id': course_id,
-        'video_progress': _json.loads(p.video_progress).get('completed', []) if p.video_progress else [],
+        'video_progress': p.completed_videos(),
         'completed': p.completed,
         'completed_at': p.completed_at.isoformat() if p.completed_at else None
     })
 
 @app.route('/api/debug/db')
 @login_required
+@use_read_replica
 def api_debug_db():
     try:
         return jsonify({
@@ -807,7 +2275,6 @@ def api_debug_db():
 @app.route('/api/progress/video_complete', methods=['POST'])
 @login_required
 def api_progress_video_complete():
-    import json as _json
     data = request.get_json(force=True)
     course_id = data.get('course_id')
     video_index = data.get('video_index')
@@ -815,46 +2282,164 @@ def api_progress_video_complete():
     if course_id is None or video_index is None:
         return jsonify({'success': False, 'message': 'course_id and video_index are required'}), 400
 
-    course = Course.query.get(course_id)
-    if not course:
+    # Only the denormalized count (and subject, for the summary) is needed
+    row = db.session.query(Course.video_count, Course.class_level, Course.subject).filter(Course.id == course_id).first()
+    if row is None:
         return jsonify({'success': False, 'message': 'Course not found'}), 404
+    video_count, class_level, subject = row
 
-    videos = course.get_videos()
-    if not isinstance(video_index, int) or video_index < 0 or video_index >= len(videos):
+    if not isinstance(video_index, int) or video_index < 0 or video_index >= video_count:
         return jsonify({'success': False, 'message': 'Invalid video_index'}), 400
 
-    progress = Progress.query.filter_by(student_id=current_user.id, course_id=course_id).first()
+    progress = Progress.query.filter_by(student_id=current_user.id, course_id=course_id, assignment_id=None).first()
     if not progress:
         progress = Progress(student_id=current_user.id, course_id=course_id)
 
-    # Update video progress list
-    current = []
-    if progress.video_progress:
-        try:
-            current = _json.loads(progress.video_progress).get('completed', [])
-        except Exception:
-            current = []
-    if video_index not in current:
-        current.append(video_index)
+    # Update the completed-videos bitset
+    was_completed = bool(progress.completed)
+    newly_watched = progress.mark_video_completed(video_index)
+    mask = progress.get_video_mask()
 
     # Determine course completion
-    course_completed = len(set(current)) >= len(videos) and len(videos) > 0
-    progress.video_progress = _json.dumps({'completed': sorted(set(current))})
+    full = _all_videos_mask(video_count)
+    course_completed = video_count > 0 and (mask & full) == full
     progress.completed = course_completed
     if course_completed:
         progress.completed_at = datetime.utcnow()
 
     db.session.add(progress)
+    db.session.flush()
+    apply_summary_deltas(current_user.id, {subject: {
+        'videos': 1 if newly_watched else 0,
+        'courses': int(course_completed) - int(was_completed),
+    }})
+    if newly_watched:
+        record_progress_event(current_user.id, 'video', class_level, subject,
+                              course_id=course_id, video_index=video_index)
+    if course_completed and not was_completed:
+        record_progress_event(current_user.id, 'course_complete', class_level, subject, course_id=course_id)
     db.session.commit()
 
     return jsonify({
         'success': True,
         'course_id': course_id,
-        'completed_indices': sorted(set(current)),
-        'total_videos': len(videos),
+        'completed_indices': _mask_to_indices(mask),
+        'total_videos': video_count,
         'course_completed': course_completed
     })
 
+def _parse_client_ts(value):
+    """Parse an ISO-8601 timestamp sent by a client; returns naive UTC or None."""
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        ts = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if ts.tzinfo is not None:
+        from datetime import timezone
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+@app.route('/api/progress/video_complete_batch', methods=['POST'])
+@login_required
+def api_progress_video_complete_batch():
+    """Apply many buffered video-complete events in one transaction.
+
+    Body: {"events": [{"course_id": 1, "video_index": 0, "watched_at": "2025-01-01T10:00:00Z"}, ...]}
+    Replaying the same events is harmless: completion is a bitwise OR.
+    """
+    data = request.get_json(force=True, silent=True) or {}
+    events = data.get('events')
+    if not isinstance(events, list) or not events:
+        return jsonify({'success': False, 'message': 'events must be a non-empty list'}), 400
+    if len(events) > 1000:
+        return jsonify({'success': False, 'message': 'At most 1000 events per batch'}), 413
+
+    # Validate shape first, then resolve all referenced courses in one query
+    rejected = []
+    wanted = {}  # course_id -> (mask of new bits, latest watched_at)
+    def _is_int(v):
+        # bool is an int subclass (True == 1), and lists/dicts are unhashable
+        return isinstance(v, int) and not isinstance(v, bool)
+    course_ids = {e.get('course_id') for e in events if isinstance(e, dict) and _is_int(e.get('course_id'))}
+    counts, subjects, class_levels = {}, {}, {}
+    if course_ids:
+        for cid, video_count, class_level, subject in db.session.query(
+                Course.id, Course.video_count, Course.class_level, Course.subject).filter(Course.id.in_(course_ids)):
+            counts[cid] = video_count
+            subjects[cid] = subject
+            class_levels[cid] = class_level
+    for i, e in enumerate(events):
+        if not isinstance(e, dict):
+            rejected.append({'index': i, 'message': 'Event must be an object'})
+            continue
+        course_id = e.get('course_id')
+        video_index = e.get('video_index')
+        if not _is_int(course_id) or course_id not in counts:
+            rejected.append({'index': i, 'message': 'Course not found'})
+            continue
+        if not _is_int(video_index) or video_index < 0 or video_index >= counts[course_id]:
+            rejected.append({'index': i, 'message': 'Invalid video_index'})
+            continue
+        mask, latest = wanted.get(course_id, (0, None))
+        ts = _parse_client_ts(e.get('watched_at'))
+        if ts and (latest is None or ts > latest):
+            latest = ts
+        wanted[course_id] = (mask | (1 << video_index), latest)
+
+    results = []
+    if wanted:
+        existing = {
+            p.course_id: p for p in Progress.query.filter(
+                Progress.student_id == current_user.id,
+                Progress.course_id.in_(wanted.keys()),
+                Progress.assignment_id.is_(None)
+            ).all()
+        }
+        now = datetime.utcnow()
+        deltas = {}
+        for course_id, (new_bits, latest) in wanted.items():
+            progress = existing.get(course_id)
+            if not progress:
+                progress = Progress(student_id=current_user.id, course_id=course_id)
+                db.session.add(progress)
+            old_mask = progress.get_video_mask()
+            was_completed = bool(progress.completed)
+            mask = old_mask | new_bits
+            progress.set_video_mask(mask)
+            full = _all_videos_mask(counts[course_id])
+            course_completed = counts[course_id] > 0 and (mask & full) == full
+            if course_completed and not progress.completed:
+                # Client clocks can be wrong; never record a completion in the future
+                progress.completed_at = min(latest, now) if latest else now
+            progress.completed = course_completed
+            d = deltas.setdefault(subjects[course_id], {'videos': 0, 'courses': 0})
+            d['videos'] += bin(mask).count('1') - bin(old_mask).count('1')
+            d['courses'] += int(course_completed) - int(was_completed)
+            for index in _mask_to_indices(mask & ~old_mask):
+                record_progress_event(current_user.id, 'video', class_levels[course_id], subjects[course_id],
+                                      course_id=course_id, video_index=index, created_at=now)
+            if course_completed and not was_completed:
+                record_progress_event(current_user.id, 'course_complete', class_levels[course_id], subjects[course_id],
+                                      course_id=course_id, created_at=now)
+            results.append({
+                'course_id': course_id,
+                'completed_indices': _mask_to_indices(mask),
+                'total_videos': counts[course_id],
+                'course_completed': course_completed
+            })
+        db.session.flush()
+        apply_summary_deltas(current_user.id, deltas, at=now)
+        db.session.commit()
+
+    return jsonify({
+        'success': True,
+        'applied': len(events) - len(rejected),
+        'rejected': rejected,
+        'courses': results
+    })
+
 # --- Admin routes ---
 @app.route('/admin')
 @admin_required
@@ -863,9 +2448,361 @@ def admin_index():
 
 @app.route('/admin/dashboard')
 @admin_required
+@use_read_replica
 def admin_dashboard():
     return render_template('admin/dashboard.html')
 
+# Class-wide analytics: all Progress rows are bulk-loaded into NumPy columns and
+# reduced in analytics.compute(); the result is cached per process for
+# ANALYTICS_REFRESH_SECONDS (or until ?refresh=1).
+_analytics_cache = {'data': None, 'at': 0.0}
+_analytics_lock = threading.Lock()
+
+def _load_progress_frame():
+    import analytics
+    from sqlalchemy.orm import aliased
+    course_c = aliased(Course)
+    assignment_c = aliased(Course)
+    q = (db.session.query(Progress.student_id, db.func.coalesce(Assignment.course_id, Progress.course_id),
+                          Progress.assignment_id, Progress.video_bits, Progress.video_progress, Progress.score,
+                          Progress.completed,
+                          db.func.coalesce(assignment_c.class_level, course_c.class_level),
+                          db.func.coalesce(assignment_c.subject, course_c.subject))
+         .outerjoin(course_c, course_c.id == Progress.course_id)
+         .outerjoin(Assignment, Assignment.id == Progress.assignment_id)
+         .outerjoin(assignment_c, assignment_c.id == Assignment.course_id))
+    rows = []
+    for sid, cid, assignment_id, bits, video_json, score, completed, class_level, subject in q.yield_per(5000):
+        if bits is None and video_json:
+            # Rows not yet migrated still carry the JSON list
+            mask = _mask_from_video_json(video_json)
+            bits = mask.to_bytes(max(1, (mask.bit_length() + 7) // 8), 'little')
+        rows.append((sid, cid, assignment_id is not None, bits, score, completed, class_level, subject))
+    courses = db.session.query(Course.id, Course.name, Course.class_level, Course.subject, Course.video_count).all()
+    return analytics.build_frame(rows, courses), len(rows)
+
+def get_class_analytics(force: bool = False) -> dict:
+    import time as _time
+    import analytics
+    with _analytics_lock:
+        data = _analytics_cache['data']
+        if data is not None and not force and \
+                _time.monotonic() - _analytics_cache['at'] < app.config['ANALYTICS_REFRESH_SECONDS']:
+            return data
+        started = _time.perf_counter()
+        frame, n_rows = _load_progress_frame()
+        students = dict(db.session.query(Student.class_level, db.func.count(Student.id))
+                        .filter(Student.is_admin.is_(False)).group_by(Student.class_level).all())
+        stats = analytics.compute(frame, students)
+        ids = {e['student_id'] for board in stats['leaderboards'].values() for e in board}
+        names = dict(db.session.query(Student.id, Student.name).filter(Student.id.in_(ids)).all()) if ids else {}
+        for board in stats['leaderboards'].values():
+            for e in board:
+                e['name'] = names.get(e['student_id'])
+        data = {
+            'generated_at': datetime.utcnow().isoformat(),
+            'compute_ms': round((_time.perf_counter() - started) * 1000.0, 1),
+            'progress_rows': n_rows,
+            'students': students,
+            **stats
+        }
+        _analytics_cache.update(data=data, at=_time.monotonic())
+        return data
+
+def _analytics_filtered(items):
+    class_level = request.args.get('class_level')
+    subject = request.args.get('subject')
+    return [i for i in items
+            if (not class_level or i['class_level'] == class_level) and (not subject or i['subject'] == subject)]
+
+def _analytics_request() -> dict:
+    return get_class_analytics(force=request.args.get('refresh') in ('1', 'true'))
+
+@app.route('/admin/analytics')
+@admin_required
+@use_read_replica
+def admin_analytics():
+    data = _analytics_request()
+    return jsonify({'success': True, 'generated_at': data['generated_at'], 'compute_ms': data['compute_ms'],
+                    'progress_rows': data['progress_rows'], 'students': data['students'],
+                    'groups': _analytics_filtered(data['groups'])})
+
+@app.route('/admin/analytics/courses')
+@admin_required
+@use_read_replica
+def admin_analytics_courses():
+    data = _analytics_request()
+    return jsonify({'success': True, 'generated_at': data['generated_at'],
+                    'courses': _analytics_filtered(data['courses'])})
+
+@app.route('/admin/analytics/leaderboard')
+@admin_required
+@use_read_replica
+def admin_analytics_leaderboard():
+    data = _analytics_request()
+    limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+    class_level = request.args.get('class_level')
+    boards = {k: v[:limit] for k, v in data['leaderboards'].items() if not class_level or k == class_level}
+    return jsonify({'success': True, 'generated_at': data['generated_at'], 'leaderboards': boards})
+
+# Hourly/daily rollups of the ProgressEvent log. Each batch reads events past the
+# high-water mark in RollupState, adds them into ProgressRollup and advances the
+# mark in the same transaction, so trend charts cost O(new events).
+_ROLLUP_BUCKETS = ('hour', 'day')
+_rollup_lock = threading.Lock()
+
+def _period_start(bucket: str, ts):
+    if bucket == 'hour':
+        return ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def _rollup_batch(events) -> None:
+    totals = {}  # (bucket, period_start, class_level, subject) -> [videos, courses, assignments, score_total]
+    active = {}  # same key -> student ids seen in this batch
+    for e in events:
+        class_level = e.class_level or ''
+        subject = e.subject or 'General'
+        for bucket in _ROLLUP_BUCKETS:
+            period = _period_start(bucket, e.created_at)
+            for dims in ((class_level, subject), (class_level, '*'), ('*', subject), ('*', '*')):
+                key = (bucket, period) + dims
+                t = totals.setdefault(key, [0, 0, 0, 0.0])
+                if e.kind == 'video':
+                    t[0] += 1
+                elif e.kind == 'course_complete':
+                    t[1] += 1
+                elif e.kind == 'assignment':
+                    t[2] += 1
+                    t[3] += e.score or 0.0
+                elif e.kind == 'score_adjust':
+                    # Regrade correction, back-dated to the original submission's period
+                    t[3] += e.score or 0.0
+                    continue
+                active.setdefault(key, set()).add(e.student_id)
+
+    periods = {key[:2]: set() for key in totals}
+    for key, students in active.items():
+        periods[key[:2]].update(students)
+    new_active = {}
+    for (bucket, period), students in periods.items():
+        seen = {
+            (bucket, period, cl, subj, sid) for cl, subj, sid in db.session.query(
+                RollupActiveStudent.class_level, RollupActiveStudent.subject, RollupActiveStudent.student_id
+            ).filter(RollupActiveStudent.bucket == bucket, RollupActiveStudent.period_start == period,
+                     RollupActiveStudent.student_id.in_(students))
+        } if students else set()
+        markers = [key + (sid,) for key, ids in active.items() if key[:2] == (bucket, period)
+                   for sid in ids if key + (sid,) not in seen]
+        for m in markers:
+            new_active[m[:4]] = new_active.get(m[:4], 0) + 1
+        if markers:
+            db.session.execute(db.insert(RollupActiveStudent), [
+                {'bucket': m[0], 'period_start': m[1], 'class_level': m[2], 'subject': m[3], 'student_id': m[4]}
+                for m in markers
+            ])
+        existing = {
+            (r.bucket, r.period_start, r.class_level, r.subject): r for r in ProgressRollup.query.filter(
+                ProgressRollup.bucket == bucket, ProgressRollup.period_start == period)
+        }
+        for key, (videos, courses, assignments, score_total) in totals.items():
+            if key[:2] != (bucket, period):
+                continue
+            row = existing.get(key)
+            if row is None:
+                row = ProgressRollup(bucket=key[0], period_start=key[1], class_level=key[2], subject=key[3],
+                                     videos_watched=0, courses_completed=0, assignments_submitted=0,
+                                     score_total=0.0, active_students=0)
+                db.session.add(row)
+            row.videos_watched += videos
+            row.courses_completed += courses
+            row.assignments_submitted += assignments
+            row.score_total += score_total
+            row.active_students += new_active.get(key, 0)
+
+    # Markers are only needed while events for a period can still arrive
+    last = events[-1].created_at
+    for bucket, step in (('hour', timedelta(hours=1)), ('day', timedelta(days=1))):
+        cutoff = _period_start(bucket, last) - step
+        RollupActiveStudent.query.filter(RollupActiveStudent.bucket == bucket,
+                                         RollupActiveStudent.period_start < cutoff).delete()
+
+def run_progress_rollup(batch_size: int = None, max_batches: int = None) -> dict:
+    """Consume ProgressEvent rows past the high-water mark into ProgressRollup.
+
+    The id high-water mark assumes events become visible in id order. That
+    holds on the SQLite primary (one writer; ids are assigned under the write
+    lock), so this always reads the primary, never the read replica. On a
+    backend with concurrent writers an event can commit after a larger id was
+    consumed and would be skipped; set ROLLUP_SETTLE_SECONDS there so a batch
+    stops at the first event younger than that.
+    """
+    from flask import g, has_request_context
+    if has_request_context():
+        g.db_read_replica = False
+    batch_size = batch_size or app.config['ROLLUP_BATCH_SIZE']
+    settle = app.config['ROLLUP_SETTLE_SECONDS']
+    processed = batches = 0
+    with _rollup_lock:
+        while max_batches is None or batches < max_batches:
+            state = db.session.get(RollupState, 'progress')
+            if state is None:
+                db.session.add(RollupState(name='progress', last_event_id=0))
+                db.session.commit()
+                continue
+            start_id = state.last_event_id
+            events = (db.session.query(ProgressEvent.id, ProgressEvent.student_id, ProgressEvent.kind, ProgressEvent.score,
+                                       ProgressEvent.class_level, ProgressEvent.subject, ProgressEvent.created_at)
+                      .filter(ProgressEvent.id > start_id).order_by(ProgressEvent.id).limit(batch_size).all())
+            full_batch = len(events) == batch_size
+            if settle > 0:
+                cutoff = datetime.utcnow() - timedelta(seconds=settle)
+                young = next((i for i, e in enumerate(events) if e.created_at > cutoff), None)
+                if young is not None:
+                    events = events[:young]
+                    full_batch = False
+            if not events:
+                db.session.rollback()
+                break
+            # Claim the range first; a runner in another process holding the same mark updates nothing
+            claimed = (db.session.query(RollupState)
+                       .filter(RollupState.name == 'progress', RollupState.last_event_id == start_id)
+                       .update({'last_event_id': events[-1].id, 'updated_at': datetime.utcnow()},
+                               synchronize_session=False))
+            if not claimed:
+                db.session.rollback()
+                continue
+            _rollup_batch(events)
+            db.session.commit()
+            processed += len(events)
+            batches += 1
+            if not full_batch:
+                break
+    state = db.session.get(RollupState, 'progress')
+    return {'events': processed, 'batches': batches, 'last_event_id': state.last_event_id if state else 0}
+
+@app.route('/admin/analytics/trends')
+@admin_required
+def admin_analytics_trends():
+    bucket = request.args.get('bucket', 'day')
+    if bucket not in _ROLLUP_BUCKETS:
+        return jsonify({'success': False, 'message': 'bucket must be hour or day'}), 400
+    days = max(1, min(request.args.get('days', 30 if bucket == 'day' else 2, type=int), 366))
+    if app.config['ROLLUP_ON_READ']:
+        try:
+            run_progress_rollup()
+        except Exception as e:
+            db.session.rollback()
+            app.logger.warning(f"Progress rollup failed: {e}")
+    since = _period_start(bucket, datetime.utcnow() - timedelta(days=days))
+    rows = (ProgressRollup.query
+            .filter(ProgressRollup.bucket == bucket, ProgressRollup.period_start >= since,
+                    ProgressRollup.class_level == (request.args.get('class_level') or '*'),
+                    ProgressRollup.subject == (request.args.get('subject') or '*'))
+            .order_by(ProgressRollup.period_start).all())
+    return jsonify({'success': True, 'bucket': bucket, 'series': [{
+        'period_start': r.period_start.isoformat(),
+        'active_students': r.active_students,
+        'videos_watched': r.videos_watched,
+        'courses_completed': r.courses_completed,
+        'assignments_submitted': r.assignments_submitted,
+        'average_score': round(r.score_total / r.assignments_submitted, 1) if r.assignments_submitted else None
+    } for r in rows]})
+
+# Streaming progress export: rows come off a server-side cursor in yield_per
+# batches and are encoded into ~64 KB chunks of a generator response, so memory
+# stays flat regardless of row count.
+_EXPORT_COLUMNS = [
+    'progress_id', 'student_id', 'student_name', 'student_email', 'student_class',
+    'kind', 'course_id', 'course_name', 'class_level', 'subject', 'assignment_id', 'assignment_title',
+    'videos_completed', 'videos_total', 'completed', 'score', 'completed_at', 'created_at',
+]
+_EXPORT_CHUNK_BYTES = 64 * 1024
+
+def iter_progress_export(kind=None, class_level=None, batch_size: int = 2000):
+    """Yield one tuple per Progress row, ordered by id, in _EXPORT_COLUMNS order."""
+    course_id = db.func.coalesce(Assignment.course_id, Progress.course_id)
+    stmt = (db.select(Progress.id, Student.id, Student.name, Student.email, Student.class_level,
+                      Progress.assignment_id, course_id, Course.name, Course.class_level, Course.subject,
+                      Assignment.title, Progress.video_bits, Progress.video_progress, Course.video_count,
+                      Progress.completed, Progress.score, Progress.completed_at, Progress.created_at)
+            .join(Student, Student.id == Progress.student_id)
+            .outerjoin(Assignment, Assignment.id == Progress.assignment_id)
+            .outerjoin(Course, Course.id == course_id)
+            .order_by(Progress.id))
+    if kind == 'videos':
+        stmt = stmt.where(Progress.assignment_id.is_(None))
+    elif kind == 'assignments':
+        stmt = stmt.where(Progress.assignment_id.isnot(None))
+    if class_level:
+        stmt = stmt.where(Student.class_level == class_level)
+    result = db.session.execute(stmt.execution_options(stream_results=True, yield_per=batch_size))
+    for (pid, sid, name, email, student_class, assignment_id, cid, course_name, course_class, subject,
+         title, bits, video_json, video_count, completed, score, completed_at, created_at) in result:
+        is_assignment = assignment_id is not None
+        mask = int.from_bytes(bits, 'little') if bits else _mask_from_video_json(video_json)
+        yield (
+            pid, sid, name, email, student_class,
+            'assignment' if is_assignment else 'videos', cid, course_name, course_class, subject,
+            assignment_id, title,
+            None if is_assignment else bin(mask).count('1'), None if is_assignment else video_count,
+            bool(completed), score if is_assignment else None,
+            completed_at.isoformat() if completed_at else None, created_at.isoformat() if created_at else None,
+        )
+
+def _export_chunks(rows, fmt: str):
+    import io
+    import csv
+    import json as _json
+    buf = io.StringIO()
+    writer = csv.writer(buf) if fmt == 'csv' else None
+    if writer:
+        writer.writerow(_EXPORT_COLUMNS)
+    for row in rows:
+        if writer:
+            writer.writerow(['' if v is None else v for v in row])
+        else:
+            buf.write(_json.dumps(dict(zip(_EXPORT_COLUMNS, row)), ensure_ascii=False, separators=(',', ':')))
+            buf.write('\n')
+        if buf.tell() >= _EXPORT_CHUNK_BYTES:
+            yield buf.getvalue().encode('utf-8')
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode('utf-8')
+
+def _gzip_chunks(chunks):
+    import zlib
+    z = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    for chunk in chunks:
+        out = z.compress(chunk)
+        if out:
+            yield out
+    yield z.flush()
+
+@app.route('/admin/export/progress')
+@admin_required
+@use_read_replica
+def admin_export_progress():
+    """Download all progress/score rows: ?format=csv|jsonl&gzip=1&kind=videos|assignments&class_level=9th"""
+    from flask import Response, stream_with_context
+    fmt = request.args.get('format', 'csv')
+    if fmt not in ('csv', 'jsonl'):
+        return jsonify({'success': False, 'message': 'format must be csv or jsonl'}), 400
+    kind = request.args.get('kind') or None
+    if kind not in (None, 'videos', 'assignments'):
+        return jsonify({'success': False, 'message': 'kind must be videos or assignments'}), 400
+    compress = request.args.get('gzip') in ('1', 'true')
+    chunks = _export_chunks(iter_progress_export(kind, request.args.get('class_level') or None), fmt)
+    filename = f"progress-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.{fmt}"
+    if compress:
+        chunks = _gzip_chunks(chunks)
+        filename += '.gz'
+        mimetype = 'application/gzip'
+    else:
+        mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    return Response(stream_with_context(chunks), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
+
 # Admin uploads
 from werkzeug.utils import secure_filename
 
@@ -908,42 +2845,118 @@ def admin_uploads():
         course_list = []
     return render_template('admin/uploads.html', files=items, courses=course_list, allowed_ext=app.config.get('ALLOWED_EXTENSIONS', set()))
 
+def import_courses_csv(stream, chunk_size: int = None, progress=None) -> dict:
+    """Create/update courses from a CSV byte stream (name, class_level, subject, description).
+
+    Rows are read incrementally and matched against (name, class_level, subject)
+    keys preloaded in one query; each chunk of rows is written with one batched
+    INSERT and one batched UPDATE and committed, then progress(stats) is called.
+    """
+    import csv
+    import codecs
+    import time as _time
+    chunk_size = chunk_size or app.config['COURSE_IMPORT_CHUNK_SIZE']
+    started = _time.perf_counter()
+    existing = {}
+    for cid, name, class_level, subject in (db.session.query(Course.id, Course.name, Course.class_level, Course.subject)
+                                            .order_by(Course.id.desc())):
+        # Lowest id wins for duplicate keys, as with .first()
+        existing[(name, class_level, subject or '')] = cid
+    stats = {'rows': 0, 'created': 0, 'updated': 0, 'skipped': 0, 'chunks': 0}
+    new_courses = {}  # key -> row to insert in this chunk
+    updates = {}  # course id -> description
+
+    def flush_chunk():
+        if new_courses:
+            # Core executemany; column defaults (video_count, created_at) still apply
+            if db.engine.dialect.insert_executemany_returning:
+                inserted = db.session.execute(
+                    db.insert(Course).returning(Course.id, Course.name, Course.class_level, Course.subject),
+                    list(new_courses.values()))
+            else:
+                db.session.execute(db.insert(Course), list(new_courses.values()))
+                inserted = (db.session.query(Course.id, Course.name, Course.class_level, Course.subject)
+                            .filter(Course.name.in_({k[0] for k in new_courses})))
+            for cid, name, class_level, subject in inserted:
+                existing.setdefault((name, class_level, subject or ''), cid)
+        if updates:
+            db.session.execute(db.update(Course), [{'id': cid, 'description': d} for cid, d in updates.items()])
+        db.session.commit()
+        new_courses.clear()
+        updates.clear()
+        stats['chunks'] += 1
+        stats['elapsed_seconds'] = round(_time.perf_counter() - started, 2)
+        if progress:
+            progress(dict(stats))
+
+    pending = 0
+    for row in csv.DictReader(codecs.getreader('utf-8-sig')(stream)):
+        stats['rows'] += 1
+        name = (row.get('name') or '').strip()
+        class_level = (row.get('class_level') or '').strip()
+        subject = (row.get('subject') or '').strip()
+        description = (row.get('description') or '').strip()
+        if not name or not class_level:
+            stats['skipped'] += 1
+            continue
+        key = (name, class_level, subject)
+        if key in new_courses:
+            if description:
+                new_courses[key]['description'] = description
+            stats['updated'] += 1
+        elif key in existing:
+            if description:
+                updates[existing[key]] = description
+            stats['updated'] += 1
+        else:
+            new_courses[key] = {'name': name, 'class_level': class_level, 'subject': subject, 'description': description}
+            stats['created'] += 1
+        pending += 1
+        if pending >= chunk_size:
+            flush_chunk()
+            pending = 0
+    if pending or not stats['chunks']:
+        flush_chunk()
+    return stats
+
 @app.route('/admin/uploads/courses', methods=['POST'])
 @admin_required
 def admin_upload_courses():
-    import csv
+    wants_json = request.args.get('format') == 'json' or request.accept_mimetypes.best == 'application/json'
     f = request.files.get('file')
     if not f or not f.filename:
+        if wants_json:
+            return jsonify({'success': False, 'message': 'Upload a CSV file with course data'}), 400
         flash('Upload a CSV file with course data')
         return redirect(url_for('admin_uploads'))
     if not f.filename.lower().endswith('.csv'):
+        if wants_json:
+            return jsonify({'success': False, 'message': 'Please upload a .csv file'}), 400
         flash('Please upload a .csv file')
         return redirect(url_for('admin_uploads'))
+    last = {}
+
+    def report(stats):
+        last.update(stats)
+        app.logger.info(f"Course import {f.filename}: {stats['rows']} rows, {stats['created']} created, "
+                        f"{stats['updated']} updated ({stats['elapsed_seconds']}s)")
     try:
-        text = f.read().decode('utf-8-sig')
-        reader = csv.DictReader(text.splitlines())
-        created = 0
-        updated = 0
-        for row in reader:
-            name = (row.get('name') or '').strip()
-            class_level = (row.get('class_level') or '').strip()
-            subject = (row.get('subject') or '').strip()
-            description = (row.get('description') or '').strip()
-            if not name or not class_level:
-                continue
-            existing = Course.query.filter_by(name=name, class_level=class_level, subject=subject).first()
-            if existing:
-                existing.description = description or existing.description
-                db.session.add(existing)
-                updated += 1
-            else:
-                db.session.add(Course(name=name, class_level=class_level, subject=subject, description=description))
-                created += 1
-        db.session.commit()
-        flash(f'Courses processed. Created: {created}, Updated: {updated}')
+        stats = import_courses_csv(f.stream, progress=report)
     except Exception as e:
         db.session.rollback()
-        flash(f'Failed to import courses: {e}')
+        # Chunks committed before the failure stay imported
+        if last:
+            invalidate_catalog_cache()
+        message = f"Failed to import courses after {last.get('rows', 0)} rows: {e}"
+        if wants_json:
+            return jsonify({'success': False, 'message': message, **last}), 400
+        flash(message)
+        return redirect(url_for('admin_uploads'))
+    invalidate_catalog_cache()
+    if wants_json:
+        return jsonify({'success': True, **stats})
+    flash(f"Courses processed. Created: {stats['created']}, Updated: {stats['updated']}"
+          + (f", Skipped: {stats['skipped']}" if stats['skipped'] else ''))
     return redirect(url_for('admin_uploads'))
 
 @app.route('/admin/uploads/videos', methods=['POST'])
@@ -985,10 +2998,10 @@ def admin_upload_videos():
         if not norm:
             flash('No valid video entries found')
             return redirect(url_for('admin_uploads'))
-        import json as _json2
-        course.video_data = _json2.dumps(norm, ensure_ascii=False)
+        course.set_videos(norm)
         db.session.add(course)
         db.session.commit()
+        invalidate_catalog_cache()
         flash(f'Attached {len(norm)} videos to "{course.name}"')
     except Exception as e:
         db.session.rollback()
@@ -1027,88 +3040,64 @@ def contact():
     
     return render_template('contact.html')
 
+# UI translation bundles live in translations/<lang>.json. They are compacted
+# once (on first use) into ready-to-send bytes with an ETag; the combined hash
+# is the bundle version, so /api/translations/<version>/<lang> can be cached
+# forever by browsers and by main.js (localStorage).
+_translations = None
+_translations_lock = threading.Lock()
+
+def _load_translations():
+    global _translations
+    with _translations_lock:
+        if _translations is None:
+            import json as _json
+            import hashlib
+            folder = os.path.join(app.root_path, 'translations')
+            bundles = {}
+            for name in sorted(os.listdir(folder)):
+                if not name.endswith('.json'):
+                    continue
+                with open(os.path.join(folder, name), encoding='utf-8') as f:
+                    data = _json.load(f)
+                body = _json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                bundles[name[:-5]] = (body, hashlib.sha1(body).hexdigest())
+            version = hashlib.sha1(''.join(etag for _, (_, etag) in sorted(bundles.items())).encode()).hexdigest()[:12]
+            _translations = (version, bundles)
+        return _translations
+
+def translations_version() -> str:
+    return _load_translations()[0]
+
+@app.context_processor
+def _inject_translations_version():
+    # Templates expose it as <meta name="i18n-version" content="{{ translations_version }}">
+    return {'translations_version': translations_version()}
+
+def _translations_response(language, max_age, immutable=False):
+    version, bundles = _load_translations()
+    body, etag = bundles.get(language) or bundles['en']
+    resp = app.response_class(body, mimetype='application/json')
+    resp.set_etag(etag)
+    resp.headers['Cache-Control'] = f"public, max-age={max_age}" + (', immutable' if immutable else '')
+    resp.headers['X-Translations-Version'] = version
+    return resp.make_conditional(request)
+
 @app.route('/api/translations/<language>')
 def get_translations(language):
     """Get translations for specified language"""
-    translations = {
-        'en': {
-            'title': 'EduReach',
-            'tagline': 'Education for Rural People',
-            'home': 'Home',
-            'login': 'Login',
-            'courses': 'Courses',
-            'assignments': 'Assignments',
-            'progress': 'Progress',
-            'contact': 'Contact',
-            'about_text': 'EduReach is dedicated to providing quality education access to rural communities through innovative technology and comprehensive learning resources.',
-            'physics': 'Physics',
-            'chemistry': 'Chemistry',
-            'mathematics': 'Mathematics',
-            'assignments_subtitle': 'Test your knowledge and track your progress',
-            'ninth_class_label': '9th Class:',
-            'tenth_class_label': '10th Class:',
-            'clear_filters': 'Clear Filters',
-            'no_match_title': 'No matching assignments',
-            'no_match_desc': 'Try clearing filters or selecting a different subject.',
-            'submit_assignment': 'Submit Assignment',
-            'assignment_completed': 'Assignment Completed!',
-            'your_score': 'Your Score:',
-            'question_label': 'Question',
-            'enter_answer_placeholder': 'Enter your answer here...'
-        },
-        'te': {
-            'title': 'ఎడ్యుఆర్చ్',
-            'tagline': 'గ్రామీణ ప్రజలకు విద్య',
-            'home': 'హోమ్',
-            'login': 'లాగిన్',
-            'courses': 'కోర్సులు',
-            'assignments': 'అసైన్‌మెంట్స్',
-            'progress': 'పురోగతి',
-            'contact': 'సంప్రదించండి',
-            'about_text': 'ఎడ్యుఆర్చ్ ఆవిష్కర సాంకేతికత మరియు సమగ్ర అభ్యాస వనరుల ద్వారా గ్రామీణ సమాజాలకు గుణమైన విద్య అందించడానికి అంకితం చేయబడింది.',
-            'physics': 'భౌతిక శాస్త్రం',
-            'chemistry': 'రసాయన శాస్త్రం',
-            'mathematics': 'గణితం',
-            'assignments_subtitle': 'మీ జ్ఞానాన్ని పరీక్షించండి మరియు మీ పురోగతిని ట్రాక్ చేయండి',
-            'ninth_class_label': '9వ తరగతి:',
-            'tenth_class_label': '10వ తరగతి:',
-            'clear_filters': 'ఫిల్టర్‌లు క్లియర్ చేయండి',
-            'no_match_title': 'పోలిన అసైన్‌మెంట్లు లేవు',
-            'no_match_desc': 'ఫిల్టర్‌లను క్లియర్ చేయండి లేదా వేరే అంశాన్ని ఎంచుకోండి.',
-            'submit_assignment': 'అసైన్‌మెంట్ పంపించండి',
-            'assignment_completed': 'అసైన్‌మెంట్ పూర్తయింది!',
-            'your_score': 'మీ స్కోరు:',
-            'question_label': 'ప్రశ్న',
-            'enter_answer_placeholder': 'మీ సమాధానాన్ని ఇక్కడ నమోదు చేయండి...'
-        },
-        'kn': {
-            'title': 'ಎಡ್ಯುರೀಚ್',
-            'tagline': 'ಗ್ರಾಮೀಣ ಜನರಿಗೆ ಶಿಕ್ಷಣ',
-            'home': 'ಮುಖ್ಯಪುಟ',
-            'login': 'ಲಾಗಿನ್',
-            'courses': 'ಕೋರ್ಸ್‌ಗಳು',
-            'assignments': 'ಕಾರ್ಯಯೋಜನೆಗಳು',
-            'progress': 'ಪ್ರಗತಿ',
-            'contact': 'ಸಂಪರ್ಕಿಸಿ',
-            'about_text': 'ಎಡ್ಯುರೀಚ್ ನವೀನ ತಂತ್ರಜ್ಞಾನ ಮತ್ತು ಸಮಗ್ರ ಕಲಿಕಾ ಸಂಪನ್ಮೂಲಗಳ ಮೂಲಕ ಗ್ರಾಮೀಣ ಸಮುದಾಯಗಳಿಗೆ ಗುಣಮಟ್ಟದ ಶಿಕ್ಷಣ ಪ್ರವೇಶವನ್ನು ಒದಗಿಸಲು ಸಮರ್ಪಿಸಲಾಗಿದೆ.',
-            'physics': 'ಭೌತಶಾಸ್ತ್ರ',
-            'chemistry': 'ರಸಾಯನಶಾಸ್ತ್ರ',
-            'mathematics': 'ಗಣಿತ',
-            'assignments_subtitle': 'ನಿಮ್ಮ ಜ್ಞಾನವನ್ನು ಪರೀಕ್ಷಿಸಿ ಮತ್ತು ನಿಮ್ಮ ಪ್ರಗತಿಯನ್ನು ಕಣ್ಗಾಲಿಡಿ',
-            'ninth_class_label': '9ನೇ ತರಗತಿ:',
-            'tenth_class_label': '10ನೇ ತರಗತಿ:',
-            'clear_filters': 'ಫಿಲ್ಟರ್‌ಗಳನ್ನು ತೆರವುಗೊಳಿಸಿ',
-            'no_match_title': 'ಹೊಂದುವ ಕಾರ್ಯಯೋಜನೆಗಳಿಲ್ಲ',
-            'no_match_desc': 'ಫಿಲ್ಟರ್ ತೆರವು ಮಾಡಿ ಅಥವಾ ಬೇರೆ ವಿಷಯವನ್ನು ಆಯ್ಕೆಮಾಡಿ.',
-            'submit_assignment': 'ಕಾರ್ಯಯೋಜನೆ ಸಲ್ಲಿಸಿ',
-            'assignment_completed': 'ಕಾರ್ಯಯೋಜನೆ ಪೂರ್ಣಗೊಂಡಿದೆ!',
-            'your_score': 'ನಿಮ್ಮ ಅಂಕ:',
-            'question_label': 'ಪ್ರಶ್ನೆ',
-            'enter_answer_placeholder': 'ನಿಮ್ಮ ಉತ್ತರವನ್ನು ಇಲ್ಲಿ ನಮೂದಿಸಿ...'
-        }
-    }
-    
-    return jsonify(translations.get(language, translations['en']))
+    return _translations_response(language, max_age=300)
+
+@app.route('/api/translations/<version>/<language>')
+def get_translations_versioned(version, language):
+    """Versioned bundle URL: content never changes, so it is cached for a year"""
+    # No 'en' fallback here: it would be cached as immutable under this language's URL
+    if language not in _load_translations()[1]:
+        return jsonify({'success': False, 'message': 'Unknown language'}), 404
+    current = translations_version()
+    if version != current:
+        return redirect(url_for('get_translations_versioned', version=current, language=language))
+    return _translations_response(language, max_age=31536000, immutable=True)
 
 # Debug-only seeding endpoint for 9th class assignments (Chemistry & Mathematics)
 @app.route('/admin/seed/assignments_9th', methods=['POST', 'GET'])
@@ -1201,11 +3190,13 @@ def admin_seed_assignments_9th():
     _upsert_assignment('9th Class Chemistry – 30 MCQs', 'Comprehensive 30 MCQs across 9th Class Chemistry syllabus.', chem_course, CHEMISTRY_9TH)
     _upsert_assignment('9th Class Mathematics – 30 MCQs', 'Comprehensive 30 MCQs across 9th Class Mathematics syllabus.', math_course, MATHEMATICS_9TH)
     db.session.commit()
+    invalidate_answer_keys()
     return jsonify({'success': True, 'seeded': ['9th Class Chemistry – 30 MCQs', '9th Class Mathematics – 30 MCQs']})
 
-if __name__ == '__main__':
+def seed_admin_account() -> None:
+    """Create (or promote) the ADMIN_EMAIL account. Run once per deployment
+    start: by `python app.py`, `python wsgi.py`, or gunicorn's master process."""
     with app.app_context():
-        db.create_all()
         # Seed admin user if ADMIN_EMAIL and ADMIN_PASSWORD provided
         admin_email = os.getenv('ADMIN_EMAIL', '').strip()
         admin_password = os.getenv('ADMIN_PASSWORD', '').strip()
@@ -1217,11 +3208,13 @@ if __name__ == '__main__':
                         name='Administrator',
                         email=admin_email,
                         class_level='admin',
-                        password_hash=generate_password_hash(admin_password),
+                        # Hashed inline: this may run in gunicorn's master, which must not start the hash pool
+                        password_hash=generate_password_hash(admin_password, method=app.config['PASSWORD_HASH_METHOD']),
                         email_verified=True,
                         is_admin=True
                     ))
                     db.session.commit()
+                    invalidate_user_cache()
                     app.logger.info(f"Seeded admin account: {admin_email}")
                 except Exception as e:
                     app.logger.error(f"Failed to seed admin user: {e}")
@@ -1232,8 +3225,15 @@ if __name__ == '__main__':
                     existing.email_verified = True
                     db.session.add(existing)
                     db.session.commit()
+                    invalidate_user_cache(existing.id)
         else:
             app.logger.info('ADMIN_EMAIL/ADMIN_PASSWORD not set; skipping admin seeding')
+
+if __name__ == '__main__':
+    # Development server only; see wsgi.py / gunicorn.conf.py for production
+    create_app()
+    seed_admin_account()
+    start_mail_worker()
     host = os.getenv('HOST', '0.0.0.0')
     port = int(os.getenv('PORT', '5000'))
     app.run(host=host, port=port, debug=True)
@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+import hmac
+import hashlib
+import secrets
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# Microbenchmark for the password hashing policy. Times one hash + verify per
+# candidate method on a single core and estimates logins/second/core, where a
+# login costs one password verify plus one OTP HMAC issue and check.
+# Usage: python bench_password_hash.py [method ...]
+#   e.g. python bench_password_hash.py scrypt:16384:8:1 pbkdf2:sha256:600000
+
+DEFAULT_METHODS = [
+    os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1'),
+    'scrypt:16384:8:1',
+    'pbkdf2:sha256:600000',
+    'pbkdf2:sha256:300000',
+]
+
+
+def _time_per_op(fn, min_seconds=1.0) -> float:
+    n = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        n += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds and n >= 3:
+            return elapsed / n
+
+
+def bench_otp() -> float:
+    key = secrets.token_bytes(32)
+
+    def issue_and_check():
+        code = f"{secrets.randbelow(1000000):06d}"
+        stored = hmac.new(key, f"42:{code}".encode(), hashlib.sha256).hexdigest()
+        hmac.compare_digest(stored, hmac.new(key, f"42:{code}".encode(), hashlib.sha256).hexdigest())
+    return _time_per_op(issue_and_check, 0.5)
+
+
+if __name__ == '__main__':
+    methods = sys.argv[1:] or list(dict.fromkeys(DEFAULT_METHODS))
+    otp_cost = bench_otp()
+    print(f"OTP HMAC issue+verify: {otp_cost * 1e6:.1f} us")
+    print(f"{'method':<28} {'hash ms':>9} {'verify ms':>10} {'logins/s/core':>14}")
+    for method in methods:
+        try:
+            stored = generate_password_hash('correct horse battery staple', method=method)
+        except Exception as e:
+            print(f"{method:<28} error: {e}")
+            continue
+        hash_cost = _time_per_op(lambda: generate_password_hash('correct horse battery staple', method=method))
+        verify_cost = _time_per_op(lambda: check_password_hash(stored, 'correct horse battery staple'))
+        per_login = verify_cost + otp_cost
+        print(f"{method:<28} {hash_cost * 1e3:>9.1f} {verify_cost * 1e3:>10.1f} {1 / per_login:>14.1f}")
@@ -0,0 +1,131 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+import subprocess
+
+# Concurrent progress-write benchmark for the SQLite engine profile.
+# For each profile (SQLITE_PROFILE=default, then tuned) it builds a fresh
+# temporary database, then runs P processes x T threads of simulated students,
+# each POSTing /api/progress/video_complete through the app. It reports
+# committed writes/sec and failed requests (e.g. "database is locked").
+#   python bench_sqlite_writes.py --students 400 --processes 4 --threads 8 --writes 25
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def setup(students, courses, videos):
+    from app import create_app, db, Student, Course
+    app = create_app()
+    with app.app_context():
+        for i in range(courses):
+            c = Course(name=f'Bench course {i}', class_level='9th', subject='Physics', description='')
+            c.set_videos([{'title': f'Video {v}', 'url': f'https://example.com/{i}/{v}'} for v in range(videos)])
+            db.session.add(c)
+        db.session.add_all([
+            Student(name=f'Bench {i}', email=f'bench{i}@example.com', class_level='9th',
+                    password_hash='x', email_verified=True)
+            for i in range(students)
+        ])
+        db.session.commit()
+
+
+def worker(index, processes, threads, writes, students, courses, videos, out_path):
+    from app import create_app
+    app = create_app()
+    results = []
+    lock = threading.Lock()
+
+    def student_loop(slot):
+        # Students are split across all threads of all processes
+        global_slot = index * threads + slot
+        ids = list(range(global_slot + 1, students + 1, processes * threads))
+        client = app.test_client()
+        ok = failed = 0
+        rnd = random.Random(global_slot)
+        for _ in range(writes):
+            uid = rnd.choice(ids)
+            with client.session_transaction() as sess:
+                sess['_user_id'] = str(uid)
+                sess['_fresh'] = True
+            resp = client.post('/api/progress/video_complete', json={
+                'course_id': rnd.randint(1, courses), 'video_index': rnd.randrange(videos)})
+            if resp.status_code == 200:
+                ok += 1
+            else:
+                failed += 1
+        with lock:
+            results.append((ok, failed))
+
+    ts = [threading.Thread(target=student_loop, args=(i,)) for i in range(threads)]
+    started = time.time()
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    with open(out_path, 'w') as f:
+        json.dump({'ok': sum(r[0] for r in results), 'failed': sum(r[1] for r in results),
+                   'start': started, 'end': time.time()}, f)
+
+
+def run_profile(profile, args):
+    tmp = tempfile.mkdtemp(prefix='edureach-bench-')
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+               SQLITE_PROFILE=profile, MAIL_MODE='file')
+    common = ['--students', str(args.students), '--courses', str(args.courses), '--videos', str(args.videos)]
+    subprocess.run([sys.executable, __file__, '--setup'] + common, cwd=BASE_DIR, env=env, check=True,
+                   stderr=subprocess.DEVNULL)
+    outs = [os.path.join(tmp, f'out{i}.json') for i in range(args.processes)]
+    procs = [
+        subprocess.Popen([sys.executable, __file__, '--worker', str(i), '--out', outs[i],
+                          '--processes', str(args.processes), '--threads', str(args.threads),
+                          '--writes', str(args.writes)] + common,
+                         cwd=BASE_DIR, env=env, stderr=subprocess.DEVNULL)
+        for i in range(args.processes)
+    ]
+    for p in procs:
+        p.wait()
+    ok = failed = 0
+    starts, ends = [], []
+    for path in outs:
+        try:
+            with open(path) as f:
+                r = json.load(f)
+            ok += r['ok']
+            failed += r['failed']
+            starts.append(r['start'])
+            ends.append(r['end'])
+        except (OSError, ValueError):
+            pass
+    # Measure only the write phase, not interpreter/app start-up
+    wall = (max(ends) - min(starts)) if starts else float('nan')
+    print(f"{profile:<8} {ok:>7} writes ok  {failed:>6} failed  {wall:>6.1f}s  {ok / wall:>8.1f} writes/s")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Concurrent SQLite progress-write benchmark')
+    parser.add_argument('--students', type=int, default=400)
+    parser.add_argument('--courses', type=int, default=20)
+    parser.add_argument('--videos', type=int, default=10)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--writes', type=int, default=25, help='requests per simulated client thread')
+    parser.add_argument('--profile', action='append', choices=['default', 'tuned'])
+    parser.add_argument('--setup', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--out', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.setup:
+        setup(args.students, args.courses, args.videos)
+    elif args.worker is not None:
+        worker(args.worker, args.processes, args.threads, args.writes,
+               args.students, args.courses, args.videos, args.out)
+    else:
+        print(f"{args.processes} processes x {args.threads} threads x {args.writes} writes, "
+              f"{args.students} students, {args.courses} courses")
+        for profile in args.profile or ['default', 'tuned']:
+            run_profile(profile, args)
@@ -1,6 +1,8 @@
-from app import app, db, Assignment
+from app import create_app, db, Assignment, get_answer_key
 import json
 
+app = create_app()
+
 with app.app_context():
     assignments = Assignment.query.all()
     print(f'Total assignments: {len(assignments)}')
@@ -10,6 +12,12 @@ with app.app_context():
         print(f'Title: {a.title}')
         print(f'Course ID: {a.course_id}')
         print(f'Questions length: {len(a.questions or "")}')
+        key = get_answer_key(a.id)
+        if key.is_mcq:
+            # Multi-character answer keys (e.g. "True", "42") are graded by full string, not packed letters
+            print(f'Grading: {"packed single-letter" if key.compiled else "full-string"} ({key.total} questions)')
+        else:
+            print('Grading: free-text')
         
         try:
             if a.questions:
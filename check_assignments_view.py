@@ -1,4 +1,6 @@
-from app import app, db, Assignment, Course
+from app import create_app, db, Assignment, Course
+
+app = create_app()
 
 with app.app_context():
     assignments = Assignment.query.all()
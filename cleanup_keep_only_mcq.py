@@ -1,4 +1,6 @@
-from app import app, db, Assignment, Progress
+from app import create_app, db, Assignment, Progress, rebuild_student_summaries
+
+app = create_app()
 
 target_title = '9th Class Physics – 30 MCQs'
 
@@ -24,5 +26,7 @@ if __name__ == '__main__':
         for a in doomed:
             db.session.delete(a)
             removed += 1
+        db.session.flush()
+        rebuild_student_summaries()
         db.session.commit()
         print(f"Removed {removed} assignments and {removed_progress} related progress rows. Kept {len(keep_ids)} assignment(s).")
@@ -0,0 +1,34 @@
+import os
+
+# gunicorn -c gunicorn.conf.py wsgi:app
+# Worker/thread counts follow the CPU count unless WEB_CONCURRENCY /
+# GUNICORN_THREADS are set. Workers are gthread so requests blocked on SQLite
+# or SMTP do not hold a whole process.
+
+cpus = os.cpu_count() or 1
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', str(cpus * 2 + 1)))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+keepalive = 5
+accesslog = os.getenv('GUNICORN_ACCESSLOG') or None
+errorlog = '-'
+
+
+def on_starting(server):
+    # Runs once in the master before any worker is forked: apply migrations and
+    # seed the admin account here instead of in every worker.
+    from app import create_app, seed_admin_account, db
+    app = create_app()
+    seed_admin_account()
+    with app.app_context():
+        # Do not hand the master's pooled SQLite connections to forked workers
+        db.engine.dispose()
+
+
+def post_fork(server, worker):
+    # Each worker sends its share of the SMTP queue, including rows left
+    # queued or retrying by the previous run
+    from app import start_mail_worker
+    start_mail_worker()
@@ -1,6 +1,16 @@
-from app import app, db
+from app import app, create_app, get_schema_version, SCHEMA_VERSION
+
+# Create tables and apply any pending schema migrations (the app also does this
+# on startup). Replaces the old migrate_add_*.py / migrate_update_progress_table.py
+# scripts, whose column additions are now schema migration 1.
 
 if __name__ == "__main__":
     with app.app_context():
-        db.create_all()
-        print("Database tables created (if not existing).")
+        before = get_schema_version()
+    create_app()
+    with app.app_context():
+        after = get_schema_version()
+    if after is None:
+        print("Database tables created (if not existing). Non-SQLite database: no schema version tracking.")
+    else:
+        print(f"Database schema version {before} -> {after} (latest {SCHEMA_VERSION}).")
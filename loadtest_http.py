@@ -0,0 +1,144 @@
+import os
+import sys
+import time
+import signal
+import argparse
+import threading
+import subprocess
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# Requests/sec harness: hammers GET endpoints with C concurrent clients for a
+# fixed duration and reports throughput and latency percentiles.
+#   python loadtest_http.py --url http://127.0.0.1:5000
+#   python loadtest_http.py --compare     # starts dev server and production server, runs both
+# --compare launches `python app.py` (Werkzeug, debug) and the production entry
+# point (gunicorn on Linux/macOS if installed, otherwise waitress via wsgi.py)
+# on spare ports against the configured database.
+
+DEFAULT_PATHS = ['/api/translations/en', '/api/translations/te']
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _pct(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))]
+
+
+def run(base, paths, concurrency, duration):
+    deadline = time.perf_counter() + duration
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def client(n):
+        local, local_errors = [], 0
+        i = n
+        while time.perf_counter() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(base + path, timeout=30) as resp:
+                    resp.read()
+                local.append(time.perf_counter() - start)
+            except Exception:
+                local_errors += 1
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        list(ex.map(client, range(concurrency)))
+    wall = time.perf_counter() - start
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'rps': len(latencies) / wall,
+        'p50_ms': _pct(latencies, 50) * 1e3,
+        'p99_ms': _pct(latencies, 99) * 1e3,
+    }
+
+
+def _print(label, r):
+    print(f"{label:<12} {r['rps']:>9.1f} req/s  p50={r['p50_ms']:.1f}ms  p99={r['p99_ms']:.1f}ms  "
+          f"({r['requests']} ok, {r['errors']} errors)")
+
+
+def _wait_ready(base, path, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(base + path, timeout=2):
+                return True
+        except Exception:
+            time.sleep(0.3)
+    return False
+
+
+def _start(cmd, port):
+    env = dict(os.environ, PORT=str(port), HOST='127.0.0.1')
+    kwargs = {'cwd': BASE_DIR, 'env': env, 'stdout': subprocess.DEVNULL, 'stderr': subprocess.DEVNULL}
+    if os.name == 'nt':
+        kwargs['creationflags'] = subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs['start_new_session'] = True
+    return subprocess.Popen(cmd, **kwargs)
+
+
+def _stop(proc):
+    try:
+        if os.name == 'nt':
+            proc.send_signal(signal.CTRL_BREAK_EVENT)
+        else:
+            # The dev server's reloader runs a child process; stop the whole group
+            os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait(timeout=15)
+    except Exception:
+        proc.kill()
+
+
+def compare(paths, concurrency, duration):
+    prod_cmd = [sys.executable, 'wsgi.py']
+    if os.name != 'nt':
+        try:
+            import gunicorn  # noqa: F401
+            prod_cmd = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app']
+        except ImportError:
+            pass
+    servers = [
+        ('dev', [sys.executable, 'app.py'], 5091),
+        ('production', prod_cmd, 5092),
+    ]
+    results = []
+    for label, cmd, port in servers:
+        proc = _start(cmd, port)
+        base = f'http://127.0.0.1:{port}'
+        try:
+            if not _wait_ready(base, paths[0]):
+                print(f'{label}: server did not come up ({" ".join(cmd)})')
+                continue
+            results.append((label, run(base, paths, concurrency, duration)))
+        finally:
+            _stop(proc)
+    print(f'{concurrency} clients, {duration}s per server, paths: {", ".join(paths)}')
+    for label, r in results:
+        _print(label, r)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='HTTP throughput harness')
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--path', action='append', help='GET path to request (repeatable)')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--compare', action='store_true', help='start dev and production servers and compare them')
+    args = parser.parse_args()
+    paths = args.path or DEFAULT_PATHS
+    if args.compare:
+        compare(paths, args.concurrency, args.duration)
+    else:
+        _print(args.url, run(args.url.rstrip('/'), paths, args.concurrency, args.duration))
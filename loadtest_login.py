@@ -0,0 +1,108 @@
+import sys
+import time
+import json
+import argparse
+import threading
+import urllib.request
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+
+# Burst load test for POST /login against a running server. Fires N logins at
+# once from C client threads and reports latency percentiles and status codes,
+# while a probe thread times a cheap route to show it is not starved.
+# Seed verified accounts first (writes to the app's configured database):
+#   python loadtest_login.py --seed 500
+# Then, with the server running (compare HASH_POOL_WORKERS=0 vs e.g. 4):
+#   python loadtest_login.py --url http://127.0.0.1:5000 --users 500 --concurrency 100
+
+PASSWORD = 'loadtest-password'
+
+
+def seed(n):
+    from app import create_app, db, Student, hash_password
+    app = create_app()
+    with app.app_context():
+        pw_hash = hash_password(PASSWORD)
+        existing = {e for (e,) in db.session.query(Student.email).filter(Student.email.like('loadtest%@example.com'))}
+        added = 0
+        for i in range(n):
+            email = f'loadtest{i}@example.com'
+            if email in existing:
+                continue
+            db.session.add(Student(name=f'Load Test {i}', email=email, class_level='9th',
+                                   password_hash=pw_hash, email_verified=True))
+            added += 1
+        db.session.commit()
+        print(f'Seeded {added} accounts ({n - added} already present)')
+
+
+def _post_login(base, i):
+    body = json.dumps({'email': f'loadtest{i}@example.com', 'password': PASSWORD}).encode()
+    req = urllib.request.Request(base + '/login', data=body, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            resp.read()
+            status = resp.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except Exception:
+        status = 'error'
+    return time.perf_counter() - start, status
+
+
+def _pct(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))]
+
+
+def run(base, users, concurrency, probe_path='/login'):
+    stop = threading.Event()
+    probe = []
+
+    def probe_loop():
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(base + probe_path, timeout=30) as resp:
+                    resp.read()
+            except Exception:
+                pass
+            probe.append(time.perf_counter() - start)
+            time.sleep(0.05)
+
+    t = threading.Thread(target=probe_loop, daemon=True)
+    t.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        results = list(ex.map(lambda i: _post_login(base, i), range(users)))
+    wall = time.perf_counter() - start
+    stop.set()
+    t.join()
+
+    statuses = {}
+    for _, status in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    ok = [lat for lat, status in results if status == 200]
+    print(f'{users} logins in {wall:.1f}s ({users / wall:.1f}/s), status counts: {statuses}')
+    print(f'login 200s   p50={_pct(ok, 50) * 1e3:.0f}ms p95={_pct(ok, 95) * 1e3:.0f}ms p99={_pct(ok, 99) * 1e3:.0f}ms')
+    rejected = [lat for lat, status in results if status == 503]
+    if rejected:
+        print(f'login 503s   p99={_pct(rejected, 99) * 1e3:.0f}ms')
+    print(f'GET {probe_path}   p50={_pct(probe, 50) * 1e3:.0f}ms p99={_pct(probe, 99) * 1e3:.0f}ms ({len(probe)} probes)')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Burst load test for /login')
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--probe', default='/login', help='cheap route timed during the burst')
+    parser.add_argument('--seed', type=int, default=0, help='create N verified loadtest accounts and exit')
+    args = parser.parse_args()
+    if args.seed:
+        seed(args.seed)
+        sys.exit(0)
+    run(args.url.rstrip('/'), args.users, args.concurrency, args.probe)
@@ -0,0 +1,163 @@
+# Append-only spool for file-mode email (MAIL_FILE_FORMAT=spool).
+# Messages are appended as JSON lines to segment files sharded by UTC date:
+#     <root>/2025-01-31/mail-20250131T101500-<pid>-0001.jsonl
+# Each process writes its own segment, so writers never interleave. A segment
+# is closed when it reaches max_segment_bytes or the date changes; closed
+# segments are optionally gzipped in the background and day directories older
+# than retention_days are removed on rotation.
+# Tooling reads the spool with iter_messages() / read_message().
+
+import gzip
+import json
+import os
+import shutil
+import threading
+from datetime import datetime, timedelta
+
+
+class MailSpool:
+    def __init__(self, root, max_segment_bytes=16 * 1024 * 1024, compress=True, retention_days=14):
+        self.root = root
+        self.max_segment_bytes = max_segment_bytes
+        self.compress = compress
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._fh = None
+        self._day = None
+        self._path = None
+        self._seq = 0
+
+    def append(self, record: dict) -> str:
+        """Write one message record; returns its reference for read_message()."""
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        now = datetime.utcnow()
+        with self._lock:
+            day = now.strftime('%Y-%m-%d')
+            if self._fh is None or day != self._day or self._fh.tell() + len(line) > self.max_segment_bytes:
+                self._rotate(now)
+            offset = self._fh.tell()
+            self._fh.write(line)
+            self._fh.flush()
+            return f"{self._day}/{os.path.basename(self._path)}:{offset}"
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_current()
+
+    def _rotate(self, now) -> None:
+        self._close_current()
+        self._day = now.strftime('%Y-%m-%d')
+        day_dir = os.path.join(self.root, self._day)
+        os.makedirs(day_dir, exist_ok=True)
+        self._seq += 1
+        name = f"mail-{now.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{self._seq:04d}.jsonl"
+        self._path = os.path.join(day_dir, name)
+        self._fh = open(self._path, 'ab')
+        self._apply_retention(now)
+
+    def _close_current(self) -> None:
+        if self._fh is None:
+            return
+        self._fh.close()
+        closed = self._path
+        self._fh = None
+        self._path = None
+        if self.compress:
+            threading.Thread(target=compress_segment, args=(closed,), daemon=True).start()
+
+    def _apply_retention(self, now) -> None:
+        if not self.retention_days:
+            return
+        cutoff = (now - timedelta(days=self.retention_days)).strftime('%Y-%m-%d')
+        try:
+            days = os.listdir(self.root)
+        except OSError:
+            return
+        for day in days:
+            # Day directories sort lexically; anything else in root is left alone
+            if len(day) == 10 and day < cutoff and os.path.isdir(os.path.join(self.root, day)):
+                shutil.rmtree(os.path.join(self.root, day), ignore_errors=True)
+
+
+def compress_segment(path: str) -> None:
+    """Gzip a closed segment in place (<name>.jsonl -> <name>.jsonl.gz)."""
+    tmp = path + '.gz.tmp'
+    try:
+        with open(path, 'rb') as src, gzip.open(tmp, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp, path + '.gz')
+        os.remove(path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def _open_segment(path: str):
+    if os.path.exists(path):
+        return open(path, 'rb')
+    if os.path.exists(path + '.gz'):
+        return gzip.open(path + '.gz', 'rb')
+    return None
+
+
+def read_message(root: str, ref: str):
+    """Return the record stored at a reference from MailSpool.append(), or None."""
+    seg, _, offset = ref.rpartition(':')
+    fh = _open_segment(os.path.join(root, seg))
+    if fh is None:
+        return None
+    with fh:
+        # Offsets are into the uncompressed stream, so this also works after gzip
+        fh.seek(int(offset))
+        line = fh.readline()
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def iter_messages(root: str, since=None, to=None):
+    """Yield stored records oldest-first, optionally filtered by day and recipient.
+
+    ``since`` is a date/datetime; whole day directories before it are skipped.
+    """
+    try:
+        days = sorted(d for d in os.listdir(root) if len(d) == 10)
+    except OSError:
+        return
+    if since is not None:
+        days = [d for d in days if d >= since.strftime('%Y-%m-%d')]
+    want = to.strip().lower() if to else None
+    for day in days:
+        day_dir = os.path.join(root, day)
+        names = sorted(n for n in os.listdir(day_dir) if n.endswith('.jsonl') or n.endswith('.jsonl.gz'))
+        for name in names:
+            path = os.path.join(day_dir, name)
+            opener = gzip.open if name.endswith('.gz') else open
+            try:
+                with opener(path, 'rb') as fh:
+                    for line in fh:
+                        try:
+                            rec = json.loads(line)
+                        except ValueError:
+                            continue
+                        if want and (rec.get('to') or '').lower() != want:
+                            continue
+                        yield rec
+            except OSError:
+                continue
+
+
+if __name__ == '__main__':
+    import sys
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    spool_root = os.path.join(base_dir, 'instance', 'outbox', 'spool')
+    # Usage: python mail_spool.py [recipient]  -> print subject lines of spooled mail
+    recipient = sys.argv[1] if len(sys.argv) > 1 else None
+    count = 0
+    for rec in iter_messages(spool_root, to=recipient):
+        print(f"{rec.get('ts')}  {rec.get('to')}  {rec.get('subject')}")
+        count += 1
+    print(f"{count} message(s)")
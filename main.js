@@ -160,9 +160,26 @@ function initializeLanguageSupport() {
 
 async function loadTranslations(language) {
     try {
-        const response = await fetch(`/api/translations/${language}`);
-        if (response.ok) {
-            translations = await response.json();
+        // Pages carry the bundle version in <meta name="i18n-version">; a bundle cached
+        // in localStorage under that version is used without any request.
+        const versionMeta = document.querySelector('meta[name="i18n-version"]');
+        const version = versionMeta ? versionMeta.content : null;
+        const cacheKey = `translations-${language}`;
+        const cached = loadFromLocalStorage(cacheKey);
+        let bundle = (version && cached && cached.version === version) ? cached.data : null;
+        if (!bundle) {
+            const url = version ? `/api/translations/${version}/${language}` : `/api/translations/${language}`;
+            const response = await fetch(url);
+            if (response.ok) {
+                bundle = await response.json();
+                const servedVersion = response.headers.get('X-Translations-Version');
+                if (servedVersion) {
+                    saveToLocalStorage(cacheKey, { version: servedVersion, data: bundle });
+                }
+            }
+        }
+        if (bundle) {
+            translations = bundle;
             // expose for other scripts
             window.__translations = translations;
             if (!window.EduReachI18n) {
@@ -0,0 +1,63 @@
+import os
+import sqlite3
+import json
+
+# Split Course.video_data JSON blobs into normalized course_video rows and
+# refresh course.video_count. Safe to re-run: rows are rebuilt from the blobs.
+# The raw-sqlite seeding scripts call sync_course_videos() after they rewrite
+# video_data so the table the app reads from stays in step.
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+db_path = os.path.join(base_dir, 'instance', 'edureach.db')
+
+KNOWN_KEYS = ('title', 'url', 'description', 'search_url', 'title_i18n')
+
+
+def sync_course_videos(conn) -> int:
+    cur = conn.cursor()
+    cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='course_video'")
+    if not cur.fetchone():
+        # Table not created yet: the app backfills it on its next start
+        return 0
+    cur.execute("PRAGMA table_info(course)")
+    if 'video_count' not in {row[1] for row in cur.fetchall()}:
+        return 0
+
+    cur.execute("DELETE FROM course_video")
+    cur.execute("SELECT id, video_data FROM course")
+    rows = cur.fetchall()
+    for course_id, video_data in rows:
+        try:
+            entries = json.loads(video_data) if video_data else []
+        except Exception:
+            entries = []
+        if not isinstance(entries, list):
+            entries = []
+        entries = [e for e in entries if isinstance(e, dict)]
+        for pos, e in enumerate(entries):
+            extra = {k: v for k, v in e.items() if k not in KNOWN_KEYS}
+            cur.execute(
+                "INSERT INTO course_video (course_id, position, title, url, description, search_url, title_i18n, extra) "
+                "VALUES (?,?,?,?,?,?,?,?)",
+                (
+                    course_id, pos, e.get('title') or '', e.get('url') or '', e.get('description'),
+                    e.get('search_url') or None,
+                    json.dumps(e['title_i18n'], ensure_ascii=False) if e.get('title_i18n') else None,
+                    json.dumps(extra, ensure_ascii=False) if extra else None,
+                )
+            )
+        cur.execute("UPDATE course SET video_count = ? WHERE id = ?", (len(entries), course_id))
+    return len(rows)
+
+
+if __name__ == '__main__':
+    if not os.path.exists(db_path):
+        print(f"Database file not found at {db_path}. Start the app once to create it.")
+        raise SystemExit(1)
+    conn = sqlite3.connect(db_path)
+    try:
+        n = sync_course_videos(conn)
+        conn.commit()
+        print(f"Synced course_video rows for {n} courses.")
+    finally:
+        conn.close()
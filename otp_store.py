@@ -0,0 +1,128 @@
+import os
+import time
+import sqlite3
+import threading
+from collections import namedtuple
+
+# Pending login OTPs, kept out of the main database so the OTP step of a login
+# does not queue behind SQLite's single writer.
+#   MemoryOTPStore  - dict in this process (single-process / dev server)
+#   SQLiteOTPStore  - small WAL-mode SQLite file shared by all workers on a host
+# Entries carry an absolute expiry (epoch seconds) and a failed-attempt counter;
+# start_sweeper() runs a daemon thread that drops expired entries.
+
+OTPEntry = namedtuple('OTPEntry', ['otp_hash', 'expires_at', 'attempts'])
+
+
+class MemoryOTPStore:
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._sweeper = None
+
+    def put(self, user_id, otp_hash, ttl_seconds):
+        with self._lock:
+            self._entries[user_id] = OTPEntry(otp_hash, time.time() + ttl_seconds, 0)
+
+    def get(self, user_id):
+        with self._lock:
+            return self._entries.get(user_id)
+
+    def record_failure(self, user_id) -> int:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return 0
+            entry = entry._replace(attempts=entry.attempts + 1)
+            self._entries[user_id] = entry
+            return entry.attempts
+
+    def delete(self, user_id) -> bool:
+        with self._lock:
+            return self._entries.pop(user_id, None) is not None
+
+    def sweep(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [uid for uid, e in self._entries.items() if e.expires_at <= now]
+            for uid in expired:
+                del self._entries[uid]
+        return len(expired)
+
+    def start_sweeper(self, interval=60.0):
+        _start_sweeper(self, interval)
+
+
+class SQLiteOTPStore:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._sweeper = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS pending_otp ("
+            " user_id INTEGER PRIMARY KEY,"
+            " otp_hash TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0)"
+        )
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit: every statement below is a single-row write
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def put(self, user_id, otp_hash, ttl_seconds):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO pending_otp (user_id, otp_hash, expires_at, attempts) VALUES (?,?,?,0)",
+            (user_id, otp_hash, time.time() + ttl_seconds)
+        )
+
+    def get(self, user_id):
+        row = self._conn().execute(
+            "SELECT otp_hash, expires_at, attempts FROM pending_otp WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        return OTPEntry(*row) if row else None
+
+    def record_failure(self, user_id) -> int:
+        conn = self._conn()
+        conn.execute("UPDATE pending_otp SET attempts = attempts + 1 WHERE user_id = ?", (user_id,))
+        row = conn.execute("SELECT attempts FROM pending_otp WHERE user_id = ?", (user_id,)).fetchone()
+        return row[0] if row else 0
+
+    def delete(self, user_id) -> bool:
+        # rowcount tells concurrent verifiers which one actually consumed the code
+        return self._conn().execute("DELETE FROM pending_otp WHERE user_id = ?", (user_id,)).rowcount > 0
+
+    def sweep(self) -> int:
+        return self._conn().execute("DELETE FROM pending_otp WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def start_sweeper(self, interval=60.0):
+        _start_sweeper(self, interval)
+
+
+_sweeper_lock = threading.Lock()
+
+
+def _start_sweeper(store, interval):
+    with _sweeper_lock:
+        if store._sweeper is not None and store._sweeper.is_alive():
+            return
+        store._sweeper = threading.Thread(target=_sweep_loop, args=(store, interval), name='otp-sweeper', daemon=True)
+        store._sweeper.start()
+
+
+def _sweep_loop(store, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            store.sweep()
+        except Exception:
+            pass
+
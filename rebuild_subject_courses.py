@@ -1,5 +1,6 @@
-import os, sqlite3, json, re
+import os, sqlite3, json, re, pathlib
 from datetime import datetime
+from migrate_course_videos import sync_course_videos
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, 'instance', 'edureach.db')
@@ -99,6 +100,9 @@ def rebuild():
         cur = conn.cursor()
         # Clean existing data (progress -> assignment -> course)
         cur.execute('DELETE FROM progress')
+        # Summaries describe the progress rows removed above (table exists from schema 3 on)
+        if cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='student_summary'").fetchone():
+            cur.execute('DELETE FROM student_summary')
         cur.execute('DELETE FROM assignment')
         cur.execute('DELETE FROM course')
         
@@ -121,7 +125,10 @@ def rebuild():
                     'INSERT INTO course (name, class_level, subject, description, video_data, created_at) VALUES (?,?,?,?,?,?)',
                     (subj, cls, subj, description, json.dumps(videos), datetime.utcnow().isoformat())
                 )
+        sync_course_videos(conn)
         conn.commit()
+        # Tell running app workers to drop their cached course catalog
+        pathlib.Path(BASE_DIR, 'instance', 'catalog.stamp').touch()
         print('Rebuilt subject-level courses with 10 lessons each.')
     finally:
         conn.close()
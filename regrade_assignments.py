@@ -0,0 +1,26 @@
+import sys
+from app import create_app, Assignment, regrade_assignment
+
+app = create_app()
+
+# Recompute Progress.score for every stored submission after an answer key fix.
+# Usage: python regrade_assignments.py <assignment_id> [<assignment_id> ...]
+#        python regrade_assignments.py --all
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if not args:
+        print("Usage: python regrade_assignments.py <assignment_id> [...] | --all")
+        sys.exit(1)
+    with app.app_context():
+        if args == ['--all']:
+            ids = [a.id for a in Assignment.query.with_entities(Assignment.id).all()]
+        else:
+            ids = [int(x) for x in args]
+        for assignment_id in ids:
+            try:
+                r = regrade_assignment(assignment_id)
+            except ValueError as e:
+                print(e)
+                continue
+            print(f"Assignment {assignment_id}: {r['submissions']} submissions, {r['updated']} scores changed")
@@ -1,18 +1,20 @@
-from app import app, db, Course
-import json
+from app import create_app, db, Course, invalidate_catalog_cache, rebuild_student_summaries
+
+app = create_app()
 
 def add_course(name, subject, class_level, description):
-    return Course(
+    course = Course(
         name=name,
         subject=subject,
         class_level=class_level,
-        description=description,
-        video_data=json.dumps([{
-            'title': name,
-            'description': description,
-            'url': ''
-        }])
+        description=description
     )
+    course.set_videos([{
+        'title': name,
+        'description': description,
+        'url': ''
+    }])
+    return course
 
 courses_per_class = {
     '9th': {
@@ -97,7 +99,10 @@ if __name__ == '__main__':
     with app.app_context():
         # Remove existing courses and related progress
         db.session.execute(db.text('DELETE FROM progress'))
+        db.session.execute(db.text('DELETE FROM course_video'))
         db.session.execute(db.text('DELETE FROM course'))
+        # Progress is gone, so the materialized summaries must go with it
+        rebuild_student_summaries()
         
         # Create 30 courses per class (10 per subject)
         for class_level, subjects in courses_per_class.items():
@@ -106,4 +111,5 @@ if __name__ == '__main__':
                     desc = f"{subject} - {topic}"
                     db.session.add(add_course(topic, subject, class_level, desc))
         db.session.commit()
+        invalidate_catalog_cache()
         print('Reseeded courses: 30 per class (9th and 10th).')
@@ -1,4 +1,5 @@
-import os, sqlite3, json, datetime
+import os, sqlite3, json, datetime, pathlib
+from migrate_course_videos import sync_course_videos
 
 base_dir = os.path.dirname(os.path.abspath(__file__))
 db_path = os.path.join(base_dir, 'instance', 'edureach.db')
@@ -87,6 +88,9 @@ cur = conn.cursor()
 
 # Clean tables
 cur.execute('DELETE FROM progress')
+# Summaries describe the progress rows removed above (table exists from schema 3 on)
+if cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='student_summary'").fetchone():
+    cur.execute('DELETE FROM student_summary')
 cur.execute('DELETE FROM course')
 
 now = datetime.datetime.utcnow().isoformat()
@@ -101,6 +105,9 @@ for class_level, subjects in courses_per_class.items():
                 (topic, class_level, subject, desc, video_data, now)
             )
 
+sync_course_videos(conn)
 conn.commit()
 conn.close()
+# Tell running app workers to drop their cached course catalog
+pathlib.Path(base_dir, 'instance', 'catalog.stamp').touch()
 print('Reseeded (sqlite): 30 courses per class into instance/edureach.db')
@@ -21,4 +21,9 @@ if cur.rowcount == 0:
     )
 con.commit()
 con.close()
+# Tell running app processes to drop their cached user snapshots
+stamp = os.path.join('instance', 'users.stamp')
+with open(stamp, 'a'):
+    pass
+os.utime(stamp, None)
 print('Admin password reset/created for:', email)
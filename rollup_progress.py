@@ -0,0 +1,26 @@
+import time
+import argparse
+from app import create_app, run_progress_rollup
+
+app = create_app()
+
+# Fold new ProgressEvent rows into the hourly/daily ProgressRollup tables that
+# back /admin/analytics/trends. Safe to run from cron or as a long-running loop;
+# set ROLLUP_ON_READ=false in the app when this runs on a schedule.
+#   python rollup_progress.py             # catch up once
+#   python rollup_progress.py --loop 60   # catch up every 60 seconds
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Incremental progress rollups')
+    parser.add_argument('--loop', type=float, default=0, help='repeat every N seconds')
+    parser.add_argument('--batch-size', type=int, default=None)
+    args = parser.parse_args()
+    while True:
+        with app.app_context():
+            started = time.perf_counter()
+            r = run_progress_rollup(args.batch_size)
+        print(f"Rolled up {r['events']} events in {r['batches']} batches "
+              f"({time.perf_counter() - started:.2f}s), high-water mark {r['last_event_id']}")
+        if not args.loop:
+            break
+        time.sleep(args.loop)
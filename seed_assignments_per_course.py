@@ -1,6 +1,8 @@
-from app import app, db, Course, Assignment
+from app import create_app, db, Course, Assignment
 from datetime import datetime
 
+app = create_app()
+
 # Idempotent seeding: ensure 10 assignments per course.
 # Generates simple placeholder questions per assignment.
 
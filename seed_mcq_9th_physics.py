@@ -1,7 +1,9 @@
-from app import app, db, Course, Assignment
+from app import create_app, db, Course, Assignment
 import json
 from datetime import datetime
 
+app = create_app()
+
 MCQS = [
     {"q":"SI unit of speed is:","options":{"a":"m/s","b":"km/h","c":"m²/s","d":"cm²/s"},"answer":"a"},
     {"q":"A body is said to be in motion when:","options":{"a":"It rotates around itself","b":"Its position changes with respect to surroundings","c":"It vibrates only","d":"None of these"},"answer":"b"},
@@ -1,7 +1,9 @@
-from app import app, db, Assignment, Student
+from app import create_app, db, Assignment, Student
 from flask_login import login_user
 import json
 
+app = create_app()
+
 with app.app_context():
     # Get first assignment
     assignment = Assignment.query.first()
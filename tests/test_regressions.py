@@ -0,0 +1,239 @@
+import os
+import sys
+import tempfile
+
+# Regression tests against a throwaway SQLite database.
+#   python -m pytest tests
+# The app reads its configuration at import time, so point it at a temp
+# directory before importing it.
+_tmp = tempfile.mkdtemp(prefix='edureach-test-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_tmp, 'test.db')}"
+os.environ['MAIL_MODE'] = 'file'
+os.environ['UPLOAD_FOLDER'] = os.path.join(_tmp, 'uploads')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as edureach  # noqa: E402
+
+app = edureach.app
+app.instance_path = os.path.join(_tmp, 'instance')
+edureach.create_app()
+db = edureach.db
+
+_counter = [0]
+
+
+def make_student(admin=False, class_level='9th'):
+    _counter[0] += 1
+    with app.app_context():
+        s = edureach.Student(name='Test', email=f'student{_counter[0]}@example.com', class_level=class_level,
+                             password_hash='x', email_verified=True, is_admin=admin)
+        db.session.add(s)
+        db.session.commit()
+        return s.id
+
+
+def client_for(user_id):
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(user_id)
+        sess['_fresh'] = True
+    return client
+
+
+def make_course(videos=2, subject='Physics'):
+    with app.app_context():
+        c = edureach.Course(name='Course', class_level='9th', subject=subject)
+        c.set_videos([{'title': f'Video {i}', 'url': f'https://example.com/{i}'} for i in range(videos)])
+        db.session.add(c)
+        db.session.commit()
+        return c.id
+
+
+def test_set_videos_twice_on_persisted_course():
+    course_id = make_course(videos=3)
+    with app.app_context():
+        c = db.session.get(edureach.Course, course_id)
+        c.set_videos([{'title': 'New 0', 'url': 'https://example.com/a'},
+                      {'title': 'New 1', 'url': 'https://example.com/b'}])
+        db.session.commit()
+    with app.app_context():
+        c = db.session.get(edureach.Course, course_id)
+        assert [v['title'] for v in c.get_videos()] == ['New 0', 'New 1']
+        assert c.video_count == 2
+        assert edureach.CourseVideo.query.filter_by(course_id=course_id).count() == 2
+
+
+def make_assignment(course_id, answers):
+    import json
+    with app.app_context():
+        a = edureach.Assignment(course_id=course_id, title='Quiz', questions=json.dumps(
+            [{'question': f'Q{i}', 'answer': ans} for i, ans in enumerate(answers)]))
+        db.session.add(a)
+        db.session.commit()
+        return a.id
+
+
+def set_answers(assignment_id, answers):
+    import json
+    with app.app_context():
+        a = db.session.get(edureach.Assignment, assignment_id)
+        a.questions = json.dumps([{'question': f'Q{i}', 'answer': ans} for i, ans in enumerate(answers)])
+        db.session.commit()
+
+
+def test_submit_then_regrade_compiled_key():
+    course_id = make_course()
+    assignment_id = make_assignment(course_id, ['a', 'b', 'c', 'd'])
+    student_id = make_student()
+    client = client_for(student_id)
+    resp = client.post('/api/submit_assignment', json={'assignment_id': assignment_id,
+                                                       'answers': ['A', 'b', 'x', 'x']})
+    assert resp.status_code == 200
+    assert resp.get_json()['score'] == 50
+    # A video on the same course still gets its own progress row
+    resp = client.post('/api/progress/video_complete', json={'course_id': course_id, 'video_index': 0})
+    assert resp.get_json()['success'] is True
+
+    set_answers(assignment_id, ['a', 'b', 'x', 'x'])
+    with app.app_context():
+        result = edureach.regrade_assignment(assignment_id)
+        assert result == {'assignment_id': assignment_id, 'submissions': 1, 'updated': 1}
+        p = edureach.Progress.query.filter_by(student_id=student_id, assignment_id=assignment_id).one()
+        assert p.course_id == course_id
+        assert p.score == 100
+        summary = edureach.get_student_summary(student_id)
+        assert summary['average_score'] == 100
+        assert summary['videos_completed'] == 1
+
+
+def test_submit_then_regrade_uncompiled_key():
+    course_id = make_course()
+    assignment_id = make_assignment(course_id, ['True', '42'])
+    student_id = make_student()
+    resp = client_for(student_id).post('/api/submit_assignment', json={'assignment_id': assignment_id,
+                                                                       'answers': ['true', '41']})
+    assert resp.get_json()['score'] == 50
+
+    set_answers(assignment_id, ['True', '41'])
+    with app.app_context():
+        assert edureach.regrade_assignment(assignment_id)['updated'] == 1
+        p = edureach.Progress.query.filter_by(student_id=student_id, assignment_id=assignment_id).one()
+        assert p.score == 100
+
+    # Raw answers also regrade once the key becomes single-character
+    set_answers(assignment_id, ['t', '41'])
+    with app.app_context():
+        assert edureach.regrade_assignment(assignment_id)['updated'] == 1
+        p = edureach.Progress.query.filter_by(student_id=student_id, assignment_id=assignment_id).one()
+        assert p.score == 50
+
+
+def test_mail_worker_sends_rows_queued_before_startup(monkeypatch):
+    import time
+    sent = []
+    for name, value in {'MAIL_MODE': 'smtp', 'MAIL_ASYNC': True, 'MAIL_SERVER': 'localhost',
+                        'MAIL_FROM': 'noreply@example.com', 'MAIL_USERNAME': '', 'MAIL_PASSWORD': ''}.items():
+        monkeypatch.setitem(app.config, name, value)
+    monkeypatch.setattr(edureach.SMTPConnection, 'send', lambda self, msg: sent.append(msg['To']))
+    with app.app_context():
+        # Left behind by a previous process, which never called enqueue_email() after restart
+        db.session.add(edureach.OutboundEmail(to_email='queued@example.com', subject='Hi', body='Hello'))
+        db.session.commit()
+
+    assert edureach.start_mail_worker() is True
+    deadline = time.monotonic() + 10
+    while not sent and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert sent == ['queued@example.com']
+
+
+def test_mail_worker_not_started_in_file_mode():
+    assert app.config['MAIL_MODE'] == 'file'
+    assert edureach.start_mail_worker() is False
+
+
+def test_video_complete_batch_rejects_non_integer_course_ids():
+    course_id = make_course(videos=2)
+    client = client_for(make_student())
+    resp = client.post('/api/progress/video_complete_batch', json={'events': [
+        {'course_id': [course_id], 'video_index': 0},
+        {'course_id': {'id': course_id}, 'video_index': 0},
+        {'course_id': True, 'video_index': 0},
+        {'course_id': course_id, 'video_index': True},
+        {'course_id': course_id, 'video_index': 1},
+    ]})
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert [r['index'] for r in body['rejected']] == [0, 1, 2, 3]
+
+
+def test_latest_outbox_entry_scans_past_the_tail(monkeypatch):
+    import json
+    monkeypatch.setattr(edureach, '_outbox_index', edureach.OrderedDict())
+    path = edureach._outbox_index_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'ts': '2026-01-01T00:00:00', 'to': 'old@example.com', 'file': 'a.eml', 'otp': '123456'}) + '\n')
+        for i in range(200):
+            f.write(json.dumps({'ts': '2026-01-02T00:00:00', 'to': f'other{i}@example.com', 'file': 'b.eml', 'otp': None}) + '\n')
+    entry = edureach.latest_outbox_entry('Old@Example.com', chunk_bytes=100)
+    assert entry['otp'] == '123456'
+    assert edureach.latest_outbox_entry('missing@example.com', chunk_bytes=100) is None
+    os.remove(path)
+
+
+def test_outbox_index_is_compacted(monkeypatch):
+    monkeypatch.setattr(edureach, '_OUTBOX_INDEX_COMPACT_BYTES', 2000)
+    monkeypatch.setattr(edureach, '_outbox_index_compacted_size', 0)
+    with app.app_context():
+        for i in range(100):
+            edureach._record_outbox_entry(f'user{i % 3}@example.com', f'{i}.eml',
+                                          f'Your one-time password (OTP) is: {i:06d}')
+    path = edureach._outbox_index_path()
+    with open(path, encoding='utf-8') as f:
+        lines = f.readlines()
+    assert len(lines) < 40
+    monkeypatch.setattr(edureach, '_outbox_index', edureach.OrderedDict())
+    assert edureach.latest_outbox_entry('user0@example.com')['otp'] == '000099'
+    os.remove(path)
+
+
+def test_catalog_cache_normalises_paging_and_evicts_lru(monkeypatch):
+    monkeypatch.setattr(edureach, '_CATALOG_CACHE_MAX', 4)
+    monkeypatch.setattr(edureach, '_catalog_cache', edureach.OrderedDict())
+    make_course()
+    client = client_for(make_student())
+    assert client.get('/api/courses?limit=1000').status_code == 200
+    assert client.get('/api/courses?limit=500&after_id=0').status_code == 200
+    assert client.get('/api/courses?limit=500&after_id=-5').status_code == 200
+    assert len(edureach._catalog_cache) == 1
+
+    hot = next(iter(edureach._catalog_cache))
+    for after_id in range(1, 10):
+        client.get('/api/courses?limit=500')
+        client.get(f'/api/courses?limit=500&after_id={after_id}')
+    assert hot in edureach._catalog_cache
+    assert len(edureach._catalog_cache) == 4
+
+
+def test_bearer_tokens_only_authenticate_api_routes(monkeypatch):
+    monkeypatch.setitem(app.config, 'API_TOKENS', True)
+    admin_id = make_student(admin=True)
+    with app.app_context():
+        token = edureach.issue_api_token(db.session.get(edureach.Student, admin_id))
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {token}'}
+    assert client.get('/api/progress/summary', headers=headers).status_code == 200
+    assert client.get('/admin/cache-stats', headers=headers).status_code in (302, 401)
+    assert client.get('/progress', headers=headers).status_code in (302, 401)
+
+
+def test_versioned_translations_unknown_language_is_not_cached():
+    client = app.test_client()
+    version = client.get('/api/translations/en').headers['X-Translations-Version']
+    resp = client.get(f'/api/translations/{version}/xx')
+    assert resp.status_code == 404
+    assert 'immutable' not in resp.headers.get('Cache-Control', '')
+    assert 'immutable' in client.get(f'/api/translations/{version}/kn').headers['Cache-Control']
+    # The unversioned URL keeps its short-lived English fallback
+    assert client.get('/api/translations/xx').status_code == 200
@@ -1,5 +1,6 @@
-from app import app, db, Course
-import json
+from app import create_app, db, Course, invalidate_catalog_cache
+
+app = create_app()
 
 courses_data = [
     {
@@ -114,16 +115,17 @@ if __name__ == "__main__":
             obj = Course.query.filter_by(name=info['name'], class_level=info['class_level']).first()
             if obj:
                 obj.description = info['description']
-                obj.video_data = json.dumps(info['videos'])
+                obj.set_videos(info['videos'])
                 updated += 1
             else:
                 obj = Course(
                     name=info['name'],
                     class_level=info['class_level'],
-                    description=info['description'],
-                    video_data=json.dumps(info['videos'])
+                    description=info['description']
                 )
+                obj.set_videos(info['videos'])
                 db.session.add(obj)
                 created += 1
         db.session.commit()
+        invalidate_catalog_cache()
         print(f"Done. Updated: {updated}, Created: {created}")
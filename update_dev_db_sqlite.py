@@ -1,4 +1,5 @@
 import os, sqlite3, json
+from migrate_course_videos import sync_course_videos
 
 base_dir = os.path.dirname(os.path.abspath(__file__))
 db_path = os.path.join(base_dir, 'instance', 'edureach_dev.db')
@@ -115,6 +116,7 @@ for info in courses_data:
         "UPDATE course SET description = ?, video_data = ? WHERE name = ? AND class_level = ?",
         (info['description'], json.dumps(info['videos']), info['name'], info['class_level'])
     )
+sync_course_videos(conn)
 conn.commit()
 conn.close()
 print("Updated edureach_dev.db course descriptions and videos.")
\ No newline at end of file
@@ -1,4 +1,5 @@
-import os, sqlite3, json, re
+import os, sqlite3, json, re, pathlib
+from migrate_course_videos import sync_course_videos
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, 'instance', 'edureach.db')
@@ -140,8 +141,11 @@ for cls, subjects in LINKS.items():
             cur.execute("UPDATE course SET video_data = ? WHERE id = ?", (json.dumps(video), cid))
             updated += 1
 
+sync_course_videos(conn)
 conn.commit()
 conn.close()
+# Tell running app workers to drop their cached course catalog
+pathlib.Path(BASE_DIR, 'instance', 'catalog.stamp').touch()
 
 print(f"Updated {updated} courses.")
 if missing:
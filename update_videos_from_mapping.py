@@ -2,6 +2,8 @@ import re
 import json
 import os
 import sqlite3
+import pathlib
+from migrate_course_videos import sync_course_videos
 
 # Mapping pasted from user (titles and URLs)
 LINKS = {
@@ -163,8 +165,11 @@ for cls_level, subjects in LINKS.items():
             cur.execute("UPDATE course SET video_data = ? WHERE id = ?", (video_json, course['id']))
             updated += 1
 
+sync_course_videos(conn)
 conn.commit()
 conn.close()
+# Tell running app workers to drop their cached course catalog
+pathlib.Path(BASE_DIR, 'instance', 'catalog.stamp').touch()
 
 print(f"Updated {updated} course videos.")
 if unmatched:
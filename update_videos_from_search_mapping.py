@@ -1,6 +1,8 @@
 import json
 import os
 import sqlite3
+import pathlib
+from migrate_course_videos import sync_course_videos
 import re
 
 # New mapping with YouTube search URLs and recommended channels
@@ -137,8 +139,11 @@ for cls, subjects in MAPPING.items():
             cur.execute("UPDATE course SET video_data = ? WHERE id = ?", (json.dumps(video), match['id']))
             updated += 1
 
+sync_course_videos(conn)
 conn.commit()
 conn.close()
+# Tell running app workers to drop their cached course catalog
+pathlib.Path(BASE_DIR, 'instance', 'catalog.stamp').touch()
 
 print(f"Updated {updated} courses with YouTube search links.")
 if unmatched:
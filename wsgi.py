@@ -0,0 +1,27 @@
+import os
+from app import create_app, seed_admin_account, start_mail_worker
+
+# Production entry point.
+#   Linux:   gunicorn -c gunicorn.conf.py wsgi:app
+#   Windows: python wsgi.py            (waitress, one process, many threads)
+# gunicorn.conf.py runs the migrations and admin seeding once in the master
+# process; each worker importing this module then only does the version check.
+# The mail worker thread is started per serving process (gunicorn's post_fork
+# or below), never in the gunicorn master, whose threads do not survive fork.
+
+app = create_app()
+
+
+def default_threads() -> int:
+    return int(os.getenv('WAITRESS_THREADS', str(max(4, (os.cpu_count() or 1) * 4))))
+
+
+if __name__ == '__main__':
+    from waitress import serve
+    seed_admin_account()
+    start_mail_worker()
+    host = os.getenv('HOST', '0.0.0.0')
+    port = int(os.getenv('PORT', '5000'))
+    threads = default_threads()
+    app.logger.info(f"Serving on http://{host}:{port} with waitress ({threads} threads)")
+    serve(app, host=host, port=port, threads=threads)